@@ -26,6 +26,10 @@ KEY_MAP = {
 }
 
 
+# Shared read-only default for lookups of unknown players (avoids a new dict per miss)
+_EMPTY_PLAYER: Dict[str, Any] = {}
+
+
 def _get_key(data: Dict[str, Any], long_key: str, default: Any = None) -> Any:
     """
     Get value from data dict using either long or short key name.
@@ -36,6 +40,11 @@ def _get_key(data: Dict[str, Any], long_key: str, default: Any = None) -> Any:
     return data.get(short_key, data.get(long_key, default))
 
 
+def _score_sort_key(item: Tuple[str, Dict[str, Any]]) -> int:
+    """Sort key for (player_id, player_data) pairs, defined once at module level."""
+    return _get_key(item[1], 'score', 0)
+
+
 class GameStateManager:
     """
     Manages game state queries and provides convenient access to game data.
@@ -52,10 +61,14 @@ class GameStateManager:
             game_state: The raw game state dictionary from the server
         """
         self._game_state = game_state or {}
+        # Players dict of the current state, looked up once per update instead of per getter
+        self._players: Dict[str, Dict[str, Any]] = self._game_state.get('players', {})
         # Cache for reconstructed snakes (to handle delta encoding)
         self._snake_cache: Dict[str, List[Tuple[int, int]]] = {}
         # Cache for player metadata (name, color) - sent separately from game_state
         self._player_metadata: Dict[str, Dict[str, Any]] = {}
+        # Players sorted by score, computed once per received game state
+        self._sorted_players: Optional[List[Tuple[str, Dict[str, Any]]]] = None
     
     def update(self, game_state: Optional[Dict[str, Any]]) -> None:
         """
@@ -64,7 +77,13 @@ class GameStateManager:
         Args:
             game_state: New game state dictionary from server
         """
-        self._game_state = game_state or {}
+        game_state = game_state or {}
+        # The renderer calls update() every frame with the same dict, so only
+        # drop the sorted view when a new state actually arrives
+        if game_state is not self._game_state:
+            self._sorted_players = None
+        self._game_state = game_state
+        self._players = game_state.get('players', {})
     
     def update_player_metadata(self, player_id: str, name: str, color: int) -> None:
         """
@@ -87,7 +106,7 @@ class GameStateManager:
     
     def get_players(self) -> Dict[str, Dict[str, Any]]:
         """Get all players in the game."""
-        return self._game_state.get('players', {})
+        return self._players
     
     def get_player_data(self, player_id: str) -> Dict[str, Any]:
         """
@@ -97,10 +116,9 @@ class GameStateManager:
             player_id: The player's unique ID
             
         Returns:
-            Player data dictionary, or empty dict if not found
+            Player data dictionary, or a shared empty dict if not found (do not mutate)
         """
-        players = self.get_players()
-        return players.get(player_id, {})
+        return self._players.get(player_id, _EMPTY_PLAYER)
     
     def get_player_name(self, player_id: str) -> str:
         """Get a player's name (from metadata cache or player data)."""
@@ -210,17 +228,17 @@ class GameStateManager:
         Returns:
             List of (player_id, player_data) tuples sorted by score
         """
-        players = self.get_players()
-        sorted_players = sorted(
-            players.items(),
-            key=lambda x: _get_key(x[1], 'score', 0),
-            reverse=True
-        )
+        if self._sorted_players is None:
+            self._sorted_players = sorted(
+                self.get_players().items(),
+                key=_score_sort_key,
+                reverse=True
+            )
         
         if limit is not None:
-            sorted_players = sorted_players[:limit]
+            return self._sorted_players[:limit]
         
-        return sorted_players
+        return self._sorted_players
     
     # Game objects methods
     
@@ -131,6 +131,15 @@ class TestGameStateManager(unittest.TestCase):
         self.assertEqual(len(limited), 1)
         self.assertEqual(limited[0][0], 'player1')
     
+    def test_get_sorted_players_after_update(self):
+        """Test that sorted players are refreshed when a new state arrives"""
+        self.assertEqual(self.manager.get_sorted_players()[0][0], 'player1')
+        
+        new_state = {'players': {'player1': {'score': 100}, 'player3': {'sc': 900}}}
+        self.manager.update(new_state)
+        sorted_players = self.manager.get_sorted_players()
+        self.assertEqual([pid for pid, _ in sorted_players], ['player3', 'player1'])
+    
     def test_get_bricks(self):
         """Test getting bricks"""
         bricks = self.manager.get_bricks()
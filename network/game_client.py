@@ -2,7 +2,7 @@
 import socket
 import time
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 
 try:
     import msgpack
@@ -13,9 +13,36 @@ except ImportError:
     # Note: Client will use JSON if msgpack not available
     # Server should not require msgpack to be installed
 
+# Pick the fastest available JSON backend for the non-msgpack protocol: orjson > ujson > json
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        def _json_dumps(obj: Any) -> bytes:
+            return ujson.dumps(obj).encode('utf-8')
+        _json_loads = ujson.loads
+    except ImportError:
+        def _json_dumps(obj: Any) -> bytes:
+            return json.dumps(obj).encode('utf-8')
+        _json_loads = json.loads
+
 # Direction mappings for network optimization
 INT_TO_DIRECTION = {0: 'UP', 1: 'DOWN', 2: 'LEFT', 3: 'RIGHT'}
 
+# Largest possible UDP payload - game_state grows with players, bricks, bullets and bombs
+MAX_DATAGRAM_SIZE = 65507
+
+
+def _encode_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a message for the wire (MessagePack if available, otherwise JSON)"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(message, use_bin_type=True)
+    return _json_dumps(message)
+
 
 class GameClient:
     """Handle network communication with CloudSnake game server"""
@@ -37,6 +64,10 @@ class GameClient:
         self.game_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.game_socket.settimeout(2.0)  # 2 second timeout for receiving
         
+        # Reusable receive buffer for game state packets (see receive_messages)
+        self._recv_buffer = bytearray(MAX_DATAGRAM_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        
         # Client state
         self.connected = False  # Connected to server on control port
         self.in_game = False    # Connected to game on game port
@@ -51,6 +82,30 @@ class GameClient:
         self.player_data = {
             'direction': 'RIGHT',  # Only track direction on client side
         }
+        
+        # Dispatch table for handle_server_message
+        self._message_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            'game_state': self._on_game_state,
+            'leaderboard': self._on_leaderboard,
+            'pong': self._ignore_message,
+            'game_full': self._on_game_full,
+            'server_full': self._on_server_full,
+            'welcome': self._ignore_message,
+        }
+        
+        # Constant payloads are serialized once instead of on every send
+        self._ping_bytes = _encode_message({'type': 'ping'})
+        self._disconnect_bytes = _encode_message({'type': 'disconnect'})
+        self._encode_game_payloads()
+        # Reused for every direction update; 'data' shares player_data by reference
+        self._update_msg: Dict[str, Any] = {'type': 'update', 'data': self.player_data}
+    
+    def _encode_game_payloads(self) -> None:
+        """Pre-encode the constant game socket messages (shoot, bomb, respawn)"""
+        extra: Dict[str, Any] = {'player_id': self.player_id} if self.player_id else {}
+        self._shoot_bytes = _encode_message({'type': 'shoot', **extra})
+        self._throw_bomb_bytes = _encode_message({'type': 'throw_bomb', **extra})
+        self._respawn_bytes = _encode_message({'type': 'update', 'data': {'respawn': True}, **extra})
     
     def connect(self) -> bool:
         """Connect to the game server"""
@@ -79,7 +134,7 @@ class GameClient:
             # If msgpack failed or not available, try JSON
             if response is None:
                 try:
-                    response = json.loads(data.decode('utf-8'))
+                    response = _json_loads(data.decode('utf-8'))
                 except UnicodeDecodeError:
                     raise ConnectionError(
                         "Server is sending msgpack binary data, but msgpack is not available in this client. "
@@ -93,6 +148,9 @@ class GameClient:
                 self.player_id = response.get('player_id')
                 self.my_color = response.get('color')  # Will be None in lobby
                 
+                # Game socket payloads carry our player ID, so re-encode now that it is known
+                self._encode_game_payloads()
+                
                 # Send initial message on game socket to register game address with server
                 # This ensures we receive game state broadcasts even while in lobby
                 lobby_msg = {
@@ -119,7 +177,10 @@ class GameClient:
         """Receive messages from server (game state updates on game socket)"""
         while self.running:
             try:
-                data, addr = self.game_socket.recvfrom(4096)
+                # Receive into the preallocated buffer so large game states are never
+                # truncated, while only copying out the bytes actually received
+                nbytes, addr = self.game_socket.recvfrom_into(self._recv_buffer)
+                data = self._recv_view[:nbytes].tobytes()
                 
                 # Try to decode message - msgpack or JSON
                 message = None
@@ -131,13 +192,13 @@ class GameClient:
                     except Exception:
                         # Try JSON as fallback
                         try:
-                            message = json.loads(data.decode('utf-8'))
+                            message = _json_loads(data)
                         except Exception:
                             pass
                 else:
                     # Only JSON available
                     try:
-                        message = json.loads(data.decode('utf-8'))
+                        message = _json_loads(data)
                     except Exception:
                         pass
                 
@@ -147,7 +208,9 @@ class GameClient:
             except socket.timeout:
                 # Timeout is normal, continue
                 continue
-            except Exception as e:
+            except OSError as e:
+                # Covers ConnectionResetError and errors from a socket closed during shutdown;
+                # anything else is a bug and should end the thread with a traceback
                 if self.running:
                     print(f"❌ Error receiving data: {e}")
     
@@ -167,13 +230,13 @@ class GameClient:
                     except Exception:
                         # Try JSON as fallback
                         try:
-                            message = json.loads(data.decode('utf-8'))
+                            message = _json_loads(data)
                         except Exception:
                             pass
                 else:
                     # Only JSON available
                     try:
-                        message = json.loads(data.decode('utf-8'))
+                        message = _json_loads(data)
                     except Exception:
                         pass
                 
@@ -192,8 +255,9 @@ class GameClient:
             except socket.timeout:
                 # Timeout is normal, continue
                 continue
-            except Exception:
-                pass
+            except OSError:
+                # Transient socket errors (e.g. ICMP port unreachable) - keep listening
+                continue
     
     def handle_server_message(self, message: Dict[str, Any]) -> None:
         """Handle messages from server"""
@@ -202,51 +266,53 @@ class GameClient:
         # Update last received time for any message from server
         self.last_update_time = time.time()
         
-        if message_type == 'game_state':
-            self.game_state = message.get('state')
-            self.display_game_state()
-            
-            # Update my_color from game state if player is in game
-            if self.player_id and self.game_state:
-                players = self.game_state.get('players', {})
-                if self.player_id in players:
-                    player_data = players[self.player_id]
-                    # Try short keys first ('ig', 'c'), fallback to long keys
-                    in_game = player_data.get('ig', player_data.get('in_game'))
-                    color = player_data.get('c', player_data.get('color'))
-                    if in_game and color:
-                        # Handle hex int color
-                        if isinstance(color, int):
-                            r = (color >> 16) & 0xFF
-                            g = (color >> 8) & 0xFF
-                            b = color & 0xFF
-                            self.my_color = (r, g, b)
-                        else:
-                            self.my_color = tuple(color)
-        elif message_type == 'leaderboard':
-            # Leaderboard update (sent separately at slower rate)
-            if self.game_state:
-                self.game_state['leaderboard'] = message.get('leaderboard', [])
-                self.game_state['all_time_highscore'] = message.get('all_time_highscore', 0)
-                self.game_state['all_time_highscore_player'] = message.get('all_time_highscore_player', 'None')
-        elif message_type == 'pong':
-            # Heartbeat acknowledged
-            pass
-        elif message_type == 'game_full':
-            # Game is full, can't join
-            print(f"⛔ {message.get('message', 'Game is full')}")
-        elif message_type == 'server_full':
-            # Server is full, can't connect
-            print(f"⛔ {message.get('message', 'Server is full')}")
-        elif message_type == 'welcome':
-            # Already handled in connect()
-            pass
-        elif message_type == 'server_full':
-            # Server is full
-            print(f"⛔ {message.get('message', 'Server is full')}")
-            self.connected = False
-        else:
-            print(f"⚠️  Unknown message type: {message_type}")
+        self._message_handlers.get(message_type, self._on_unknown_message)(message)
+    
+    def _on_game_state(self, message: Dict[str, Any]) -> None:
+        """Store a new game state snapshot"""
+        self.game_state = message.get('state')
+        self.display_game_state()
+        
+        # Update my_color from game state if player is in game
+        if self.player_id and self.game_state:
+            players = self.game_state.get('players', {})
+            if self.player_id in players:
+                player_data = players[self.player_id]
+                # Try short keys first ('ig', 'c'), fallback to long keys
+                in_game = player_data.get('ig', player_data.get('in_game'))
+                color = player_data.get('c', player_data.get('color'))
+                if in_game and color:
+                    # Handle hex int color
+                    if isinstance(color, int):
+                        r = (color >> 16) & 0xFF
+                        g = (color >> 8) & 0xFF
+                        b = color & 0xFF
+                        self.my_color = (r, g, b)
+                    else:
+                        self.my_color = tuple(color)
+    
+    def _on_leaderboard(self, message: Dict[str, Any]) -> None:
+        """Merge a leaderboard update (sent separately at slower rate) into the game state"""
+        if self.game_state:
+            self.game_state['leaderboard'] = message.get('leaderboard', [])
+            self.game_state['all_time_highscore'] = message.get('all_time_highscore', 0)
+            self.game_state['all_time_highscore_player'] = message.get('all_time_highscore_player', 'None')
+    
+    def _on_game_full(self, message: Dict[str, Any]) -> None:
+        """Game is full, can't join"""
+        print(f"⛔ {message.get('message', 'Game is full')}")
+    
+    def _on_server_full(self, message: Dict[str, Any]) -> None:
+        """Server is full, can't connect"""
+        print(f"⛔ {message.get('message', 'Server is full')}")
+    
+    def _ignore_message(self, message: Dict[str, Any]) -> None:
+        """Messages that need no handling here (pong, or welcome already handled in connect())"""
+        pass
+    
+    def _on_unknown_message(self, message: Dict[str, Any]) -> None:
+        """Report a message type this client does not know"""
+        print(f"⚠️  Unknown message type: {message.get('type', '')}")
     
     def display_game_state(self) -> None:
         """Display current game state"""
@@ -269,9 +335,8 @@ class GameClient:
         """Send periodic ping to server to maintain connection"""
         while self.running:
             if self.connected:
-                ping_msg: Dict[str, str] = {'type': 'ping'}
                 try:
-                    self.send_to_server(ping_msg)
+                    self.control_socket.sendto(self._ping_bytes, self.server_address)
                 except Exception:
                     pass
             
@@ -279,35 +344,19 @@ class GameClient:
     
     def update_player_data(self) -> None:
         """Send player direction to server"""
-        update_msg: Dict[str, Any] = {
-            'type': 'update',
-            'data': self.player_data
-        }
-        self.send_to_server(update_msg, use_game_socket=True)
+        self.send_to_server(self._update_msg, use_game_socket=True)
     
     def shoot(self) -> None:
         """Send shoot request to server"""
-        shoot_msg: Dict[str, str] = {
-            'type': 'shoot'
-        }
-        self.send_to_server(shoot_msg, use_game_socket=True)
+        self.game_socket.sendto(self._shoot_bytes, self.game_address)
     
     def throw_bomb(self) -> None:
         """Send throw bomb request to server"""
-        throw_bomb_msg: Dict[str, str] = {
-            'type': 'throw_bomb'
-        }
-        self.send_to_server(throw_bomb_msg, use_game_socket=True)
+        self.game_socket.sendto(self._throw_bomb_bytes, self.game_address)
     
     def respawn(self) -> None:
         """Request respawn from server"""
-        respawn_msg: Dict[str, Any] = {
-            'type': 'update',
-            'data': {
-                'respawn': True
-            }
-        }
-        self.send_to_server(respawn_msg, use_game_socket=True)
+        self.game_socket.sendto(self._respawn_bytes, self.game_address)
     
     def send_to_server(self, message: Dict[str, Any], use_game_socket: bool = False) -> None:
         """Send message to server
@@ -321,10 +370,7 @@ class GameClient:
             message['player_id'] = self.player_id
         
         # Use MessagePack if available (40-60% smaller), otherwise fallback to JSON
-        if MSGPACK_AVAILABLE:
-            data = msgpack.packb(message, use_bin_type=True)
-        else:
-            data = json.dumps(message).encode('utf-8')
+        data = _encode_message(message)
         
         if use_game_socket:
             self.game_socket.sendto(data, self.game_address)
@@ -334,9 +380,8 @@ class GameClient:
     def disconnect(self) -> None:
         """Disconnect from server"""
         if self.connected:
-            disconnect_msg: Dict[str, str] = {'type': 'disconnect'}
             try:
-                self.send_to_server(disconnect_msg)
+                self.control_socket.sendto(self._disconnect_bytes, self.server_address)
             except:
                 pass
             
@@ -51,14 +51,39 @@ class TestGameClient(unittest.TestCase):
         # game_state is None until connected, which is expected
         self.assertIsNone(self.client.game_state)
     
+    def test_handle_server_message_dispatch(self):
+        """Test that server messages are routed by type"""
+        self.client.handle_server_message({'type': 'game_state', 'state': {'players': {}}})
+        self.assertEqual(self.client.game_state, {'players': {}})
+        
+        self.client.handle_server_message({'type': 'leaderboard', 'leaderboard': [{'name': 'A'}]})
+        self.assertEqual(self.client.game_state['leaderboard'], [{'name': 'A'}])
+        
+        # Known no-op and unknown types must not raise
+        self.client.handle_server_message({'type': 'pong'})
+        self.client.handle_server_message({'type': 'not_a_type'})
+    
     def test_no_pygame_dependency(self):
         """Test that GameClient doesn't import pygame"""
-        import inspect
-        source = inspect.getsource(GameClient)
-        self.assertNotIn('import pygame', source,
-                        "GameClient should not import pygame")
-        self.assertNotIn('from pygame', source,
-                        "GameClient should not import from pygame")
+        import dis
+        import types
+        from network import game_client
+        
+        # Module level: nothing bound in the namespace may come from pygame
+        for name, value in vars(game_client).items():
+            module_name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, '__module__', '')
+            self.assertFalse(str(module_name).startswith('pygame'),
+                             f"network.game_client binds {name} from pygame")
+        
+        # Method level: inspect the compiled bytecode for deferred imports (no source re-read)
+        code_objects = [f.__code__ for f in vars(GameClient).values() if isinstance(f, types.FunctionType)]
+        while code_objects:
+            code = code_objects.pop()
+            code_objects.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+            for instruction in dis.get_instructions(code):
+                if instruction.opname == 'IMPORT_NAME':
+                    self.assertFalse(instruction.argval.startswith('pygame'),
+                                     f"GameClient.{code.co_name} imports {instruction.argval}")
 
 
 if __name__ == '__main__':
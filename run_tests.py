@@ -23,15 +23,13 @@ def run_unit_tests():
     print("=" * 70)
     
     loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
+    suite = loader.loadTestsFromNames(UNIT_TEST_MODULES)
     
-    for module in UNIT_TEST_MODULES:
-        try:
-            tests = loader.loadTestsFromName(module)
-            suite.addTests(tests)
-        except Exception as e:
-            print(f"Error loading {module}: {e}")
-            return False
+    # Import failures don't raise here - the loader records them and adds placeholder tests
+    if loader.errors:
+        for error in loader.errors:
+            print(f"Error loading tests:\n{error}")
+        return False
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
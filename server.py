@@ -1,10 +1,14 @@
 import socket
-import threading
 import time
 import json
 import os
+import random
 import logging
-from typing import Dict, Tuple, Any, List, Set, Optional
+import selectors
+import gc
+import signal
+from collections import deque
+from typing import Dict, Tuple, Any, List, Set, Optional, Deque, Callable, Union
 from datetime import datetime
 
 try:
@@ -15,9 +19,47 @@ except ImportError:
     # Note: Logging not yet initialized at import time
     # Warning will be logged when server starts if msgpack not available
 
+# Fastest available JSON backend for the non-msgpack protocol: orjson > json
+# (players_snapshot is keyed by int player IDs, which orjson only accepts with OPT_NON_STR_KEYS)
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def _json_loads(data: Any) -> Any:
+        # json.loads takes bytes directly (no .decode() needed) but not a memoryview
+        return json.loads(bytes(data))
+
+# Kernel receive/send buffers per UDP socket (capped by net.core.rmem_max/wmem_max on Linux)
+RECEIVE_BUFFER_SIZE = 1 << 20
+SEND_BUFFER_SIZE = 1 << 20
+
+# Rebuild-and-compare occupied_cells at the start of every tick (debugging only - O(segments))
+VERIFY_OCCUPIED_CELLS = os.environ.get('CLOUDSNAKE_VERIFY_OCCUPIED') == '1'
+
+# Seconds between leaderboard broadcasts
+LEADERBOARD_INTERVAL = 5.0
+
+# Automatic GC is off in the event loop; collect this often, only when the next tick is this far away
+GC_INTERVAL = 1.0
+GC_MIN_SLACK = 0.01
+
+# Largest client datagram accepted (client messages are well under this)
+MAX_CLIENT_DATAGRAM_SIZE = 2048
+
+# Datagrams handled per socket per wakeup before the event loop checks its timers again
+MAX_DATAGRAMS_PER_READ = 64
+
 # Direction mappings for optimization
 DIRECTION_TO_INT = {'UP': 0, 'DOWN': 1, 'LEFT': 2, 'RIGHT': 3}
 INT_TO_DIRECTION = {0: 'UP', 1: 'DOWN', 2: 'LEFT', 3: 'RIGHT'}
+# Grid step (dx, dy) for each direction
+DIRECTION_DELTAS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
 
 def hash_address_to_player_id(address: Tuple[str, int]) -> int:
     """Hash IP:port tuple to a 2-byte integer (0-65535) for network efficiency.
@@ -31,6 +73,8 @@ def hash_address_to_player_id(address: Tuple[str, int]) -> int:
     # Take modulo to fit in 16-bit unsigned int (0-65535)
     return hash(addr_str) & 0xFFFF
 
+# Type alias for received datagram payloads (bytes, or a memoryview of a receive buffer)
+Buffer = Union[bytes, memoryview]
 # Type alias for player data dictionary
 PlayerData = Dict[str, Any]
 # Type alias for bullet data dictionary  
@@ -52,12 +96,18 @@ class GameServer:
         
         # Create control socket (port 50000) for connect, heartbeat, commands
         self.control_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.set_socket_buffers(self.control_socket)
         self.control_socket.bind((self.host, self.port))
         
         # Create game socket (port 50001) for game controls and state updates
         self.game_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.set_socket_buffers(self.game_socket)
         self.game_socket.bind((self.host, self.game_port))
         
+        # Reusable receive buffer for the event loop (handlers get a memoryview slice of it)
+        self._recv_buffer = bytearray(MAX_CLIENT_DATAGRAM_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        
         # Map control addresses to their game socket addresses: {control_address: game_address}
         self.game_addresses: Dict[Tuple[str, int], Tuple[str, int]] = {}
         
@@ -67,6 +117,18 @@ class GameServer:
         # Store connected clients: {client_address: {player_data}}
         self.clients: Dict[Tuple[str, int], PlayerData] = {}
         
+        # Message type -> handler(client_address, message) for handle_client_message
+        self._message_handlers: Dict[str, Callable[[Tuple[str, int], Dict[str, Any]], None]] = {
+            'connect': self.handle_connect,
+            'disconnect': lambda addr, _msg: self.handle_disconnect(addr),
+            'update': self.handle_player_update,
+            'ping': lambda addr, _msg: self.handle_ping(addr),
+            'shoot': lambda addr, _msg: self.handle_shoot(addr),
+            'throw_bomb': lambda addr, _msg: self.handle_throw_bomb(addr),
+            'start_game': lambda addr, _msg: self.handle_start_game(addr),
+            'leave_game': lambda addr, _msg: self.handle_leave_game(addr),
+        }
+        
         # Game state
         self.game_state: Dict[str, Any] = {
             'players': {},
@@ -125,7 +187,9 @@ class GameServer:
             (255, 105, 180),  # Hot Pink
             (147, 112, 219),  # Medium Purple
         ]
-        self.used_colors: Set[Tuple[int, int, int]] = set()  # Track colors currently in use
+        # Colors currently in use, one bit per available_colors index (bit i set = color i taken)
+        self.color_mask: int = 0
+        self.color_index: Dict[Tuple[int, int, int], int] = {c: i for i, c in enumerate(self.available_colors)}
         self.max_players = 16  # Maximum number of players allowed
         
         self.running = False
@@ -136,6 +200,23 @@ class GameServer:
         # Statistics tracking
         self.stats_file = 'player_stats.json'
         self.stats: Dict[str, Any] = self.load_stats()
+        # Set when stats change in memory; flush_stats writes them out
+        self.stats_dirty = False
+    
+    def set_socket_buffers(self, sock: socket.socket) -> None:
+        """Enlarge the kernel buffers so bursts queue up instead of being dropped
+        
+        The receive buffer holds incoming datagrams while the event loop is busy with a tick,
+        and the default overflows quickly when many players change direction at once. The
+        send buffer holds the per-tick game state fan-out; sends are non-blocking, so a full
+        buffer means clients silently miss that frame.
+        """
+        for option, size, name in ((socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE, 'receive'),
+                                   (socket.SO_SNDBUF, SEND_BUFFER_SIZE, 'send')):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, option, size)
+            except OSError as e:
+                self.logger.warning(f"Could not set socket {name} buffer: {e}")
     
     def setup_logging(self) -> None:
         """Configure logging for the server"""
@@ -194,24 +275,32 @@ class GameServer:
         """Save player statistics to file"""
         try:
             self.stats['last_updated'] = datetime.now().isoformat()
-            with open(self.stats_file, 'w') as f:
+            # Write to a temp file and swap it in so a crash mid-write can't truncate the stats
+            tmp_file = f"{self.stats_file}.tmp"
+            with open(tmp_file, 'w') as f:
                 json.dump(self.stats, f, indent=2)
+            os.replace(tmp_file, self.stats_file)
+            self.stats_dirty = False
             logging.debug("Statistics saved successfully")
         except Exception as e:
             logging.error(f"Error saving stats: {e}", exc_info=True)
     
-    def update_player_stats(self, player_name: str, score: int, kills: int = 0, died: bool = False) -> None:
-        """Update statistics for a player"""
-        if player_name not in self.stats['players']:
-            self.stats['players'][player_name] = {
+    def get_player_stats(self, player_name: str) -> Dict[str, Any]:
+        """Get the stats entry for a player, creating it if this is a new player"""
+        player_stats = self.stats['players'].get(player_name)
+        if player_stats is None:
+            player_stats = self.stats['players'][player_name] = {
                 'highscore': 0,
                 'games_played': 0,
                 'total_kills': 0,
                 'total_deaths': 0,
                 'last_seen': datetime.now().isoformat()
             }
-        
-        player_stats = self.stats['players'][player_name]
+        return player_stats
+    
+    def update_player_stats(self, player_name: str, score: int, kills: int = 0, died: bool = False) -> None:
+        """Update statistics for a player"""
+        player_stats = self.get_player_stats(player_name)
         
         # Update highscore
         if score > player_stats['highscore']:
@@ -229,8 +318,13 @@ class GameServer:
         
         player_stats['last_seen'] = datetime.now().isoformat()
         
-        # Save periodically
-        self.save_stats()
+        # Written out by flush_stats on the leaderboard interval, not on every kill/death
+        self.stats_dirty = True
+    
+    def flush_stats(self) -> None:
+        """Save statistics if anything changed since the last save"""
+        if self.stats_dirty:
+            self.save_stats()
     
     def get_top_players(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top players by highscore"""
@@ -262,154 +356,182 @@ class GameServer:
             self.logger.warning("MessagePack not installed - using JSON protocol (larger messages)")
             self.logger.warning("Install msgpack for 30% bandwidth reduction: pip install msgpack")
         
-        # Start broadcast thread (game state at 2Hz)
-        broadcast_thread = threading.Thread(target=self.broadcast_game_state, daemon=True)
-        broadcast_thread.start()
-        self.logger.info("Broadcast thread started")
-        
-        # Start leaderboard broadcast thread (slower updates at 0.2Hz / every 5 seconds)
-        leaderboard_thread = threading.Thread(target=self.broadcast_leaderboard, daemon=True)
-        leaderboard_thread.start()
-        self.logger.info("Leaderboard broadcast thread started")
-        
-        # Start listening threads for both sockets
-        control_thread = threading.Thread(target=self.listen_control, daemon=True)
-        control_thread.start()
-        self.logger.info("Control socket thread started")
-        
-        game_thread = threading.Thread(target=self.listen_game, daemon=True)
-        game_thread.start()
-        self.logger.info("Game socket thread started")
-        
         self.logger.info("Server is ready and waiting for connections")
         
-        # Keep main thread alive
+        # Both sockets, the game tick and the leaderboard (every 5 seconds) share one
+        # selector loop on the main thread
+        # Shut down cleanly on SIGTERM too (service managers, docker stop) so stats are saved
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: self.stop())
         try:
-            while self.running:
-                time.sleep(0.1)
+            self.run_event_loop()
         except KeyboardInterrupt:
             self.logger.info("Received keyboard interrupt, shutting down...")
             self.stop()
     
-    def listen_control(self) -> None:
-        """Listen for control messages on port 50000 (connect, heartbeat, commands)"""
-        while self.running:
-            client_address = None
-            try:
-                data, client_address = self.control_socket.recvfrom(1024)
-                
-                # Try msgpack first, fallback to JSON
-                message = None
+    def handle_control_datagram(self, data: Buffer, client_address: Tuple[str, int]) -> None:
+        """Decode and dispatch one datagram from the control socket"""
+        try:
+            message = self.decode_message(data)
+        except (ValueError, UnicodeDecodeError) as e:
+            self.logger.warning(f"Received undecodable data on control socket from {client_address}: {e}")
+            return
+        
+        if message is None:
+            return
+        
+        # Handle control message types
+        message_type: str = message.get('type', '')
+        if message_type in ['connect', 'disconnect', 'ping']:
+            self.handle_client_message(client_address, message)
+        else:
+            self.logger.warning(f"Unknown control message type '{message_type}' from {client_address}")
+    
+    def handle_game_datagram(self, data: Buffer, game_address: Tuple[str, int]) -> None:
+        """Decode and dispatch one datagram from the game socket"""
+        try:
+            message = self.decode_message(data)
+        except (ValueError, UnicodeDecodeError) as e:
+            self.logger.warning(f"Received undecodable data on game socket from {game_address}: {e}")
+            return
+        
+        if message is None:
+            return
+        
+        # Find the control address for this game message
+        # First, try to match by player_id in message (most reliable)
+        player_id = message.get('player_id')
+        control_address = None
+        
+        if player_id:
+            # player_id is now a short integer, look up full address
+            if isinstance(player_id, int):
+                control_address = self.id_to_address.get(player_id)
+                if control_address and control_address not in self.clients:
+                    control_address = None
+            # Legacy fallback for old string-based IDs
+            elif isinstance(player_id, str):
+                import ast
                 try:
-                    if MSGPACK_AVAILABLE:
-                        try:
-                            message = msgpack.unpackb(data, raw=False)
-                        except msgpack.exceptions.ExtraData:
-                            # Fallback to JSON if msgpack fails
-                            message = json.loads(data.decode('utf-8'))
-                    else:
-                        message = json.loads(data.decode('utf-8'))
-                except (ValueError, UnicodeDecodeError) as e:
-                    # Binary msgpack data received but msgpack not available
-                    addr_str = f"from {client_address}" if client_address else ""
-                    self.logger.warning(f"Received binary data on control socket {addr_str}, but msgpack not installed. Install with: pip install msgpack")
-                    continue
-                
-                if message is None:
-                    continue
-                
-                # Handle control message types
-                message_type: str = message.get('type', '')
-                if message_type in ['connect', 'disconnect', 'ping']:
-                    self.handle_client_message(client_address, message)
-                else:
-                    self.logger.warning(f"Unknown control message type '{message_type}' from {client_address}")
-                
-            except json.JSONDecodeError as e:
-                addr_str = f"from {client_address}" if client_address else ""
-                self.logger.warning(f"Received invalid JSON on control socket {addr_str}: {e}")
-            except Exception as e:
-                self.logger.error(f"Error receiving control data: {e}", exc_info=True)
+                    control_address = ast.literal_eval(player_id)
+                    if control_address not in self.clients:
+                        control_address = None
+                except:
+                    control_address = None
+        
+        # Fallback: match by IP and port proximity (least reliable, but handles old clients)
+        if not control_address:
+            client_ip = game_address[0]
+            # Check if there's already a mapping for this game address
+            for ctrl_addr, game_addr in self.game_addresses.items():
+                if game_addr == game_address:
+                    control_address = ctrl_addr
+                    break
+            
+            # If still not found, check unmapped clients from same IP
+            if not control_address:
+                for addr in self.clients.keys():
+                    if addr[0] == client_ip and addr not in self.game_addresses:
+                        control_address = addr
+                        break
+        
+        if control_address:
+            # Register game socket address for this control address
+            self.game_addresses[control_address] = game_address
+            
+            # Handle game message types
+            message_type: str = message.get('type', '')
+            if message_type in ['update', 'shoot', 'throw_bomb', 'start_game', 'leave_game', 'lobby_ping']:
+                if message_type != 'lobby_ping':  # Don't process lobby_ping, just register address
+                    self.handle_client_message(control_address, message)
     
-    def listen_game(self) -> None:
-        """Listen for game messages on port 50001 (game controls, actions)"""
-        while self.running:
-            game_address = None
+    def drain_socket(self, sock: socket.socket, handler: Callable[[Buffer, Tuple[str, int]], None]) -> None:
+        """Handle every datagram queued on a non-blocking socket (up to a fairness cap)
+        
+        Args:
+            sock: Readable socket
+            handler: handle_control_datagram or handle_game_datagram
+        """
+        view = self._recv_view
+        for _ in range(MAX_DATAGRAMS_PER_READ):
             try:
-                data, game_address = self.game_socket.recvfrom(1024)
-                
-                # Try msgpack first, fallback to JSON
-                message = None
+                # Receive into the preallocated buffer - no bytes object per datagram
+                nbytes, address = sock.recvfrom_into(self._recv_buffer)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                # e.g. ICMP port unreachable surfacing as ConnectionResetError on Windows
+                self.logger.debug(f"Error receiving datagram: {e}")
+                continue
+            try:
+                handler(view[:nbytes], address)
+            except Exception as e:
+                self.logger.error(f"Error handling datagram from {address}: {e}", exc_info=True)
+    
+    def run_event_loop(self) -> None:
+        """Serve both sockets, the game tick and the leaderboard from a single thread
+        
+        Everything that touches game state runs here, so handlers and the tick never
+        interleave and self.clients can't change size under an iteration.
+        """
+        self.control_socket.setblocking(False)
+        self.game_socket.setblocking(False)
+        selector = selectors.DefaultSelector()
+        selector.register(self.control_socket, selectors.EVENT_READ, self.handle_control_datagram)
+        selector.register(self.game_socket, selectors.EVENT_READ, self.handle_game_datagram)
+        
+        # Collections triggered by allocation counts would land mid-tick; run them in idle time
+        # instead, and keep the long-lived startup objects out of every full collection
+        gc.freeze()
+        gc.disable()
+        
+        now = time.monotonic()
+        next_tick = now + self.broadcast_interval
+        next_leaderboard = now + LEADERBOARD_INTERVAL
+        next_gc = now + GC_INTERVAL
+        try:
+            while self.running:
+                timeout = max(0.0, min(next_tick, next_leaderboard) - time.monotonic())
                 try:
-                    if MSGPACK_AVAILABLE:
-                        try:
-                            message = msgpack.unpackb(data, raw=False)
-                        except msgpack.exceptions.ExtraData:
-                            # Fallback to JSON if msgpack fails
-                            message = json.loads(data.decode('utf-8'))
-                    else:
-                        message = json.loads(data.decode('utf-8'))
-                except (ValueError, UnicodeDecodeError) as e:
-                    # Binary msgpack data received but msgpack not available
-                    addr_str = f"from {game_address}" if game_address else ""
-                    self.logger.warning(f"Received binary data on game socket {addr_str}, but msgpack not installed. Install with: pip install msgpack")
-                    continue
-                
-                if message is None:
-                    continue
-                
-                # Find the control address for this game message
-                # First, try to match by player_id in message (most reliable)
-                player_id = message.get('player_id')
-                control_address = None
-                
-                if player_id:
-                    # player_id is now a short integer, look up full address
-                    if isinstance(player_id, int):
-                        control_address = self.id_to_address.get(player_id)
-                        if control_address and control_address not in self.clients:
-                            control_address = None
-                    # Legacy fallback for old string-based IDs
-                    elif isinstance(player_id, str):
-                        import ast
-                        try:
-                            control_address = ast.literal_eval(player_id)
-                            if control_address not in self.clients:
-                                control_address = None
-                        except:
-                            control_address = None
-                
-                # Fallback: match by IP and port proximity (least reliable, but handles old clients)
-                if not control_address:
-                    client_ip = game_address[0]
-                    # Check if there's already a mapping for this game address
-                    for ctrl_addr, game_addr in self.game_addresses.items():
-                        if game_addr == game_address:
-                            control_address = ctrl_addr
-                            break
-                    
-                    # If still not found, check unmapped clients from same IP
-                    if not control_address:
-                        for addr in self.clients.keys():
-                            if addr[0] == client_ip and addr not in self.game_addresses:
-                                control_address = addr
-                                break
-                
-                if control_address:
-                    # Register game socket address for this control address
-                    self.game_addresses[control_address] = game_address
-                    
-                    # Handle game message types
-                    message_type: str = message.get('type', '')
-                    if message_type in ['update', 'shoot', 'throw_bomb', 'start_game', 'leave_game', 'lobby_ping']:
-                        if message_type != 'lobby_ping':  # Don't process lobby_ping, just register address
-                            self.handle_client_message(control_address, message)
+                    events = selector.select(timeout)
+                except (OSError, ValueError):
+                    # Sockets closed by stop()
+                    if not self.running:
+                        break
+                    raise
+                for key, _mask in events:
+                    self.drain_socket(key.fileobj, key.data)
                 
-            except json.JSONDecodeError as e:
-                addr_str = f"from {game_address}" if game_address else ""
-                self.logger.warning(f"Received invalid JSON on game socket {addr_str}: {e}")
-            except Exception as e:
-                self.logger.error(f"Error receiving game data: {e}", exc_info=True)
+                now = time.monotonic()
+                if now >= next_tick:
+                    # A failing tick skips one frame; letting it escape would drop every player
+                    try:
+                        self.game_tick()
+                    except Exception:
+                        self.logger.exception("Error in game tick")
+                    next_tick += self.broadcast_interval
+                    # Measure after the tick so a slow tick counts towards the overrun
+                    now = time.monotonic()
+                    if next_tick <= now:
+                        # Overran the tick - start a fresh schedule rather than bursting to catch up
+                        next_tick = now + self.broadcast_interval
+                if now >= next_leaderboard:
+                    try:
+                        self.send_leaderboard()
+                        self.flush_stats()
+                    except Exception:
+                        self.logger.exception("Error sending leaderboard")
+                    next_leaderboard = now + LEADERBOARD_INTERVAL
+                if now >= next_gc and next_tick - time.monotonic() > GC_MIN_SLACK:
+                    # Full collection: with automatic GC off nothing else ever scans the older
+                    # generations, so gc.collect(0) alone would leak cycles that survive one pass
+                    gc.collect()
+                    next_gc = now + GC_INTERVAL
+        finally:
+            # However the loop ends, don't lose up to a leaderboard interval of stats
+            self.flush_stats()
+            selector.close()
+            gc.unfreeze()
+            gc.enable()
     
     def listen(self) -> None:
         """DEPRECATED: Old single-socket listen method"""
@@ -417,66 +539,49 @@ class GameServer:
     
     def handle_client_message(self, client_address: Tuple[str, int], message: Dict[str, Any]) -> None:
         """Handle messages from clients"""
-        message_type: str = message.get('type', '')
-        
-        if message_type == 'connect':
-            self.handle_connect(client_address, message)
-        elif message_type == 'disconnect':
-            self.handle_disconnect(client_address)
-        elif message_type == 'update':
-            self.handle_player_update(client_address, message)
-        elif message_type == 'ping':
-            self.handle_ping(client_address)
-        elif message_type == 'shoot':
-            self.handle_shoot(client_address)
-        elif message_type == 'throw_bomb':
-            self.handle_throw_bomb(client_address)
-        elif message_type == 'start_game':
-            self.handle_start_game(client_address)
-        elif message_type == 'leave_game':
-            self.handle_leave_game(client_address)
+        handler = self._message_handlers.get(message.get('type', ''))
+        if handler is not None:
+            handler(client_address, message)
+    
+    def random_spawn_position(self) -> Tuple[int, int]:
+        """Pick a random start cell for a new snake, avoiding cells held by other snakes"""
+        start_pos = (random.randint(5, 35), random.randint(5, 25))
+        if start_pos not in self.occupied_cells:
+            return start_pos
+        
+        # Spawning onto another snake would leave two snakes sharing a cell
+        free_cells = [
+            (x, y)
+            for x in range(5, 36)
+            for y in range(5, 26)
+            if (x, y) not in self.occupied_cells
+        ]
+        return random.choice(free_cells) if free_cells else start_pos
     
     def get_safe_direction(self, x: int, y: int) -> str:
         """Get a safe initial direction that won't hit walls or other players within 2 steps"""
-        import random
-        
         # Use cached occupied cells
         occupied: Set[Tuple[int, int]] = self.occupied_cells
         
-        # Check each direction for safety (2 steps ahead)
+        # Check each direction for safety (2 steps ahead): both cells free and the second
+        # still on the grid
+        grid_width = self.grid_width
+        grid_height = self.grid_height
         safe_directions: List[str] = []
-        
-        # UP: check y-1 and y-2
-        if y >= 2 and (x, y-1) not in occupied and (x, y-2) not in occupied:
-            safe_directions.append('UP')
-        
-        # DOWN: check y+1 and y+2
-        if y < self.grid_height - 2 and (x, y+1) not in occupied and (x, y+2) not in occupied:
-            safe_directions.append('DOWN')
-        
-        # LEFT: check x-1 and x-2
-        if x >= 2 and (x-1, y) not in occupied and (x-2, y) not in occupied:
-            safe_directions.append('LEFT')
-        
-        # RIGHT: check x+1 and x+2
-        if x < self.grid_width - 2 and (x+1, y) not in occupied and (x+2, y) not in occupied:
-            safe_directions.append('RIGHT')
+        in_bounds: List[str] = []
+        for direction, (dx, dy) in DIRECTION_DELTAS.items():
+            far = (x + 2 * dx, y + 2 * dy)
+            if not (0 <= far[0] < grid_width and 0 <= far[1] < grid_height):
+                continue
+            in_bounds.append(direction)
+            if (x + dx, y + dy) not in occupied and far not in occupied:
+                safe_directions.append(direction)
         
         # Return a random safe direction, or fallback to any direction if none are safe
         if safe_directions:
             return random.choice(safe_directions)
-        else:
-            # Fallback: choose direction away from nearest wall
-            directions: List[str] = []
-            if y >= 2:
-                directions.append('UP')
-            if y < self.grid_height - 2:
-                directions.append('DOWN')
-            if x >= 2:
-                directions.append('LEFT')
-            if x < self.grid_width - 2:
-                directions.append('RIGHT')
-            return random.choice(directions) if directions else 'RIGHT'
+        # Fallback: choose direction away from nearest wall
+        return random.choice(in_bounds) if in_bounds else 'RIGHT'
     
     def handle_connect(self, client_address: Tuple[str, int], message: Dict[str, Any]) -> None:
         """Handle new client connections - players enter lobby first"""
@@ -488,8 +593,8 @@ class GameServer:
             self.clients[client_address] = {
                 'player_name': player_name,
                 'connected_at': time.time(),
-                'last_seen': time.time(),
-                'snake': [],
+                'last_seen': time.monotonic(),
+                'snake': deque(),
                 'snake_set': set(),
                 'direction': 'RIGHT',
                 'score': 0,
@@ -500,21 +605,14 @@ class GameServer:
                 'in_game': False  # Start in lobby
             }
             
-            # Generate short player ID (2-byte int)
+            # Generate short player ID (2-byte int), cached so broadcasts don't rehash every tick
             player_id = hash_address_to_player_id(client_address)
+            self.clients[client_address]['player_id'] = player_id
             self.id_to_address[player_id] = client_address
             
             # Initialize player stats if new
-            if player_name not in self.stats['players']:
-                self.stats['players'][player_name] = {
-                    'highscore': 0,
-                    'games_played': 0,
-                    'total_kills': 0,
-                    'total_deaths': 0,
-                    'last_seen': datetime.now().isoformat()
-                }
-            self.stats['players'][player_name]['last_seen'] = datetime.now().isoformat()
-            self.save_stats()
+            self.get_player_stats(player_name)['last_seen'] = datetime.now().isoformat()
+            self.stats_dirty = True
             
             # Send welcome message (no color yet)
             welcome_msg: Dict[str, Any] = {
@@ -545,7 +643,7 @@ class GameServer:
                         self.send_to_client(client_address, metadata_msg)
         else:
             # Client reconnecting
-            self.clients[client_address]['last_seen'] = time.time()
+            self.clients[client_address]['last_seen'] = time.monotonic()
             self.logger.debug(f"{player_name} reconnected from {client_address[0]}")
     
     def handle_disconnect(self, client_address: Tuple[str, int]) -> None:
@@ -563,8 +661,8 @@ class GameServer:
                 self.update_player_stats(player_name, final_score)
             
             # Free up the color for reuse (only if color was assigned)
-            if player_color and player_color in self.used_colors:
-                self.used_colors.remove(player_color)
+            if player_color:
+                self.release_color(player_color)
             
             # Remove occupied cells of this player
             snake_set = self.clients[client_address].get('snake_set', set())
@@ -610,11 +708,9 @@ class GameServer:
                 if opposite_directions.get(current_direction) != new_direction:
                     self.clients[client_address]['direction'] = new_direction
             
-            if 'respawn' in player_data and player_data['respawn']:
-                # Handle respawn
-                import random
-                start_x = random.randint(5, 35)
-                start_y = random.randint(5, 25)
+            # Handle respawn (only for players in the game - lobby players join via start_game)
+            if player_data.get('respawn') and self.clients[client_address].get('in_game', False):
+                start_x, start_y = self.random_spawn_position()
                 
                 # Keep half of previous score
                 previous_score = self.clients[client_address].get('score', 0)
@@ -627,7 +723,7 @@ class GameServer:
                 # Update snake and snake_set
                 old_set = self.clients[client_address].get('snake_set', set())
                 self.occupied_cells.difference_update(old_set)
-                self.clients[client_address]['snake'] = [start_pos]
+                self.clients[client_address]['snake'] = deque([start_pos])
                 self.clients[client_address]['snake_set'] = {start_pos}
                 self.clients[client_address]['direction'] = safe_direction
                 self.clients[client_address]['score'] = new_score
@@ -637,7 +733,7 @@ class GameServer:
                 # Add new occupied cell
                 self.occupied_cells.add(start_pos)
             
-            self.clients[client_address]['last_seen'] = time.time()
+            self.clients[client_address]['last_seen'] = time.monotonic()
             
             # Update game state will happen in the game loop
     
@@ -653,7 +749,7 @@ class GameServer:
         if players_in_game >= self.max_players:
             self.logger.warning(f"{player_name} tried to join full game ({players_in_game}/{self.max_players})")
             # Send game full message via game socket (since start_game came via game socket)
-            # Game address should already be registered by listen_game() before this handler is called
+            # Game address should already be registered by handle_game_datagram() before this handler is called
             full_msg: Dict[str, Any] = {
                 'type': 'game_full',
                 'message': f'Game is full ({self.max_players}/{self.max_players} players). Please wait for a slot.',
@@ -666,20 +762,14 @@ class GameServer:
                 self.send_to_client(game_address, full_msg, use_game_socket=True)
             return
         
-        import random
-        
         # Allocate color (find first available)
-        available = [c for c in self.available_colors if c not in self.used_colors]
-        if not available:
+        color = self.allocate_color()
+        if color is None:
             # No colors available (shouldn't happen if max_players <= len(available_colors))
             return
         
-        color = available[0]
-        self.used_colors.add(color)
-        
         # Random starting position for snake
-        start_x = random.randint(5, 35)
-        start_y = random.randint(5, 25)
+        start_x, start_y = self.random_spawn_position()
         
         # Get a safe initial direction
         safe_direction = self.get_safe_direction(start_x, start_y)
@@ -691,7 +781,7 @@ class GameServer:
         
         self.clients[client_address]['in_game'] = True
         self.clients[client_address]['alive'] = True
-        self.clients[client_address]['snake'] = [start_pos]
+        self.clients[client_address]['snake'] = deque([start_pos])
         self.clients[client_address]['snake_set'] = {start_pos}
         self.clients[client_address]['direction'] = safe_direction
         self.clients[client_address]['score'] = 0
@@ -701,9 +791,9 @@ class GameServer:
         self.occupied_cells.add(start_pos)
         
         # Track game session start
-        self.stats['players'][self.clients[client_address]['player_name']]['games_played'] += 1
+        self.get_player_stats(self.clients[client_address]['player_name'])['games_played'] += 1
         self.stats['total_games'] += 1
-        self.save_stats()
+        self.stats_dirty = True
         
         self.logger.info(f"{player_name} started game at ({start_x}, {start_y}) with color {color} (Players in game: {players_in_game + 1}/{self.max_players})")
         
@@ -733,8 +823,8 @@ class GameServer:
             self.update_player_stats(player_name, final_score, died=True)
             
             # Free up the color for reuse
-            if player_color and player_color in self.used_colors:
-                self.used_colors.remove(player_color)
+            if player_color:
+                self.release_color(player_color)
             
             # Mark as not in game and not alive
             self.clients[client_address]['in_game'] = False
@@ -748,6 +838,22 @@ class GameServer:
             self.occupied_cells.difference_update(old_set)
             old_set.clear()
     
+    def allocate_color(self) -> Optional[Tuple[int, int, int]]:
+        """Reserve the first free player color, or return None if all are taken"""
+        free = ~self.color_mask & ((1 << len(self.available_colors)) - 1)
+        if not free:
+            return None
+        # Isolate the lowest set bit to get the first free index
+        index = (free & -free).bit_length() - 1
+        self.color_mask |= 1 << index
+        return self.available_colors[index]
+    
+    def release_color(self, color: Tuple[int, int, int]) -> None:
+        """Return a player color to the pool"""
+        index = self.color_index.get(color)
+        if index is not None:
+            self.color_mask &= ~(1 << index)
+    
     def calculate_brick_count(self) -> int:
         """Calculate how many bricks should be active based on player count"""
         player_count = len([c for c in self.clients.values() if c.get('alive', True) and c.get('in_game', True)])
@@ -761,37 +867,46 @@ class GameServer:
     
     def spawn_brick(self) -> bool:
         """Spawn a brick at a random empty location (15% bullet brick, 15% bomb brick)"""
-        import random
-        
-        # Use cached occupied cells and bricks_set
-        occupied = set(self.occupied_cells)
-        occupied.update(self.bricks_set)
-        occupied.update(self.bullet_bricks_set)
-        occupied.update(self.bomb_bricks_set)
+        # Probe the cached sets directly instead of merging them into a fresh set per spawn
+        occupied = self.occupied_cells
+        bricks_set = self.bricks_set
+        bullet_bricks_set = self.bullet_bricks_set
+        bomb_bricks_set = self.bomb_bricks_set
         
-        # Find random empty position
+        # Find random empty position - cheap while the grid is mostly empty
         max_attempts = 100
         for _ in range(max_attempts):
-            x = random.randint(0, self.grid_width - 1)
-            y = random.randint(0, self.grid_height - 1)
-            pos = (x, y)
-            
-            if pos not in occupied:
-                # 15% chance of spawning a bomb brick
-                rand_val = random.random()
-                if rand_val < 0.15:
-                    self.bomb_bricks.append([x, y])
-                    self.bomb_bricks_set.add(pos)
-                # 15% chance of spawning a bullet brick
-                elif rand_val < 0.30:
-                    self.bullet_bricks.append([x, y])
-                    self.bullet_bricks_set.add(pos)
-                else:
-                    self.bricks.append([x, y])
-                    self.bricks_set.add(pos)
-                return True
-        
-        return False
+            pos = (random.randint(0, self.grid_width - 1), random.randint(0, self.grid_height - 1))
+            if (pos not in occupied and pos not in bricks_set
+                    and pos not in bullet_bricks_set and pos not in bomb_bricks_set):
+                break
+        else:
+            # Crowded grid: sample directly from the free cells so a spawn can't be missed
+            free_cells: List[Tuple[int, int]] = [
+                (x, y)
+                for x in range(self.grid_width)
+                for y in range(self.grid_height)
+                if (x, y) not in occupied and (x, y) not in bricks_set
+                and (x, y) not in bullet_bricks_set and (x, y) not in bomb_bricks_set
+            ]
+            if not free_cells:
+                return False
+            pos = random.choice(free_cells)
+        
+        x, y = pos
+        # 15% chance of spawning a bomb brick
+        rand_val = random.random()
+        if rand_val < 0.15:
+            self.bomb_bricks.append([x, y])
+            bomb_bricks_set.add(pos)
+        # 15% chance of spawning a bullet brick
+        elif rand_val < 0.30:
+            self.bullet_bricks.append([x, y])
+            bullet_bricks_set.add(pos)
+        else:
+            self.bricks.append([x, y])
+            bricks_set.add(pos)
+        return True
     
     def update_bricks(self) -> None:
         """Update brick count based on player count"""
@@ -800,10 +915,11 @@ class GameServer:
         # Count total bricks (regular + bullet + bomb)
         total_bricks = len(self.bricks) + len(self.bullet_bricks) + len(self.bomb_bricks)
         
-        # Add bricks if needed
+        # Add bricks if needed (stop early if the grid has no free cell left)
         while total_bricks < required_bricks:
-            self.spawn_brick()
-            total_bricks = len(self.bricks) + len(self.bullet_bricks) + len(self.bomb_bricks)
+            if not self.spawn_brick():
+                break
+            total_bricks += 1
         
         # Remove excess bricks ONLY when all players are dead (required_bricks == 0)
         if required_bricks == 0:
@@ -820,7 +936,13 @@ class GameServer:
                     self.bomb_bricks_set.discard((removed[0], removed[1]))
                 total_bricks = len(self.bricks) + len(self.bullet_bricks) + len(self.bomb_bricks)
     
-    def check_brick_collection(self, client_address: Tuple[str, int], snake: List[Tuple[int, int]]) -> Optional[str]:
+    def remove_brick(self, bricks: List[List[int]], bricks_set: Set[Tuple[int, int]], pos: Tuple[int, int]) -> None:
+        """Remove a collected brick from its list and its lookup set"""
+        bricks_set.discard(pos)
+        # list.remove compares [x, y] entries in C; callers only get here after a set hit
+        bricks.remove([pos[0], pos[1]])
+    
+    def check_brick_collection(self, client_address: Tuple[str, int], snake: Deque[Tuple[int, int]]) -> Optional[str]:
         """Check if snake head collected a brick, bullet brick, or bomb brick.
         Returns 'regular', 'bullet', 'bomb', or None."""
         if not snake:
@@ -830,12 +952,7 @@ class GameServer:
         
         # Check for bullet brick collection
         if head in self.bullet_bricks_set:
-            # Remove the bullet brick from both structures
-            self.bullet_bricks_set.discard(head)
-            for i, brick in enumerate(self.bullet_bricks):
-                if (brick[0], brick[1]) == head:
-                    self.bullet_bricks.pop(i)
-                    break
+            self.remove_brick(self.bullet_bricks, self.bullet_bricks_set, head)
             # Give player a bullet (max 5)
             current_bullets = self.clients[client_address].get('bullets', 0)
             if current_bullets < 5:
@@ -846,12 +963,7 @@ class GameServer:
         
         # Check for bomb brick collection
         if head in self.bomb_bricks_set:
-            # Remove the bomb brick from both structures
-            self.bomb_bricks_set.discard(head)
-            for i, brick in enumerate(self.bomb_bricks):
-                if (brick[0], brick[1]) == head:
-                    self.bomb_bricks.pop(i)
-                    break
+            self.remove_brick(self.bomb_bricks, self.bomb_bricks_set, head)
             # Give player a bomb (max 5)
             current_bombs = self.clients[client_address].get('bombs', 0)
             if current_bombs < 5:
@@ -862,13 +974,7 @@ class GameServer:
         
         # Check for regular brick collection
         if head in self.bricks_set:
-            # Remove the brick from both structures
-            self.bricks_set.discard(head)
-            # Also remove from list (find and remove once)
-            for i, brick in enumerate(self.bricks):
-                if (brick[0], brick[1]) == head:
-                    self.bricks.pop(i)
-                    break
+            self.remove_brick(self.bricks, self.bricks_set, head)
             # Spawn new brick
             self.spawn_brick()
             return 'regular'
@@ -929,7 +1035,6 @@ class GameServer:
             if not snake:
                 return
             
-            import random
             head = snake[0]
             direction = client_data.get('direction', 'RIGHT')
             
@@ -973,112 +1078,103 @@ class GameServer:
     
     def update_bullets(self) -> None:
         """Move bullets and check for collisions"""
-        bullets_to_remove: List[int] = []
+        bullets_to_remove: Set[int] = set()
+        grid_width = self.grid_width
+        grid_height = self.grid_height
         
         for i, bullet in enumerate(self.bullets):
             x, y = bullet['pos']
-            direction: str = bullet['direction']
+            dx, dy = DIRECTION_DELTAS.get(bullet['direction'], (0, 0))
             
             # Move bullet 3 times (triple speed - 3x snake speed)
             for _ in range(3):
                 # Calculate new position
-                if direction == 'UP':
-                    y -= 1
-                elif direction == 'DOWN':
-                    y += 1
-                elif direction == 'LEFT':
-                    x -= 1
-                elif direction == 'RIGHT':
-                    x += 1
+                x += dx
+                y += dy
                 
                 # Check wall collision
-                if x < 0 or x >= self.grid_width or y < 0 or y >= self.grid_height:
-                    bullets_to_remove.append(i)
+                if not (0 <= x < grid_width and 0 <= y < grid_height):
+                    bullets_to_remove.add(i)
                     break
                 
                 bullet['pos'] = [x, y]
                 bullet_pos = (x, y)
                 
+                # Empty cell (the common case): no snake to search for
+                if bullet_pos not in self.occupied_cells:
+                    continue
+                
                 # Check collision with snakes
                 hit_occurred = False
                 for _bullet_client_address, client_data in self.clients.items():
                     if not client_data.get('alive', True):
                         continue
                     
-                    snake = client_data.get('snake', [])
-                    if not snake:
-                        continue
-                    
                     # Check if bullet hit this snake
-                    if bullet_pos in client_data.get('snake_set', set()):
-                        # Find the hit position in the snake
-                        hit_index = None
-                        for idx, segment in enumerate(snake):
-                            if segment == bullet_pos:
-                                hit_index = idx
-                                break
-                        
-                        if hit_index is not None:
-                            # Check if it's a headshot (index 0)
-                            if hit_index == 0:
-                                # Kill the snake and clean up
-                                victim_name = client_data['player_name']
-                                victim_score = client_data.get('score', 0)
-                                shooter_name = bullet.get('shooter_name', 'Unknown')
-                                self.logger.info(f"💀 {shooter_name} headshotted {victim_name} (Score: {victim_score})")
-                                client_data['alive'] = False
-                                client_data['bullets'] = 0
-                                client_data['bombs'] = 0
-                                
-                                # Update statistics for killer and victim
-                                shooter_name = bullet.get('shooter_name', 'Unknown')
-                                if shooter_name != 'Unknown':
-                                    self.update_player_stats(shooter_name, 0, kills=1)
-                                    # Award 250 points to the killer
-                                    for addr, data in self.clients.items():
-                                        if data.get('player_name') == shooter_name:
-                                            data['score'] = data.get('score', 0) + 250
-                                            break
-                                self.update_player_stats(victim_name, victim_score, died=True)
-                                
-                                # Remove snake from occupied cells
-                                snake_set = client_data.get('snake_set', set())
-                                self.occupied_cells.difference_update(snake_set)
-                                snake_set.clear()
-                            else:
-                                # Truncate snake after hit position
-                                removed_segments = snake[hit_index:]
-                                snake[:] = snake[:hit_index]
-                                
-                                # Update snake_set
-                                snake_set = client_data.get('snake_set', set())
-                                for seg in removed_segments:
-                                    snake_set.discard(seg)
-                                    self.occupied_cells.discard(seg)
-                                
-                                # Deduct score (50 points per removed segment)
-                                score_deduction = len(removed_segments) * 50
-                                client_data['score'] = max(0, client_data.get('score', 0) - score_deduction)
-                                shooter_name = bullet.get('shooter_name', 'Unknown')
-                                victim_name = client_data['player_name']
-                                self.logger.debug(f"{shooter_name} hit {victim_name}'s body, removed {len(removed_segments)} segments (-{score_deduction} points)")
+                    snake_set = client_data['snake_set']
+                    if bullet_pos in snake_set:
+                        # Find the hit position in the snake (C-level scan, only on an actual hit)
+                        snake = client_data['snake']
+                        hit_index = snake.index(bullet_pos)
                         
+                        # Check if it's a headshot (index 0)
+                        if hit_index == 0:
+                            # Kill the snake and clean up
+                            victim_name = client_data['player_name']
+                            victim_score = client_data.get('score', 0)
+                            shooter_name = bullet.get('shooter_name', 'Unknown')
+                            self.logger.info(f"💀 {shooter_name} headshotted {victim_name} (Score: {victim_score})")
+                            client_data['alive'] = False
+                            client_data['bullets'] = 0
+                            client_data['bombs'] = 0
+                            
+                            # Update statistics for killer and victim
+                            shooter_name = bullet.get('shooter_name', 'Unknown')
+                            if shooter_name != 'Unknown':
+                                self.update_player_stats(shooter_name, 0, kills=1)
+                                # Award 250 points to the killer
+                                for addr, data in self.clients.items():
+                                    if data.get('player_name') == shooter_name:
+                                        data['score'] = data.get('score', 0) + 250
+                                        break
+                            self.update_player_stats(victim_name, victim_score, died=True)
+                            
+                            # Remove snake from occupied cells
+                            self.occupied_cells.difference_update(snake_set)
+                            snake_set.clear()
+                        else:
+                            # Truncate snake after hit position
+                            # (pop from the tail - deques can't be sliced)
+                            removed_segments = [snake.pop() for _ in range(len(snake) - hit_index)]
+                            
+                            # Update snake_set
+                            for seg in removed_segments:
+                                snake_set.discard(seg)
+                                self.occupied_cells.discard(seg)
+                            
+                            # Deduct score (50 points per removed segment)
+                            score_deduction = len(removed_segments) * 50
+                            client_data['score'] = max(0, client_data.get('score', 0) - score_deduction)
+                            shooter_name = bullet.get('shooter_name', 'Unknown')
+                            victim_name = client_data['player_name']
+                            self.logger.debug(f"{shooter_name} hit {victim_name}'s body, removed {len(removed_segments)} segments (-{score_deduction} points)")
+                    
                         hit_occurred = True
-                        bullets_to_remove.append(i)
+                        bullets_to_remove.add(i)
                         break
                 
                 if hit_occurred:
                     break
         
         # Remove bullets that hit something or went out of bounds
-        for i in reversed(sorted(set(bullets_to_remove))):
-            if i < len(self.bullets):
-                self.bullets.pop(i)
+        if bullets_to_remove:
+            # Compact in one pass instead of popping (and shifting) each removed index
+            self.bullets[:] = [b for i, b in enumerate(self.bullets) if i not in bullets_to_remove]
     
     def update_bombs(self) -> None:
         """Check bomb timers and handle explosions"""
         current_time = time.time()
-        bombs_to_remove: List[int] = []
+        bombs_to_remove: Set[int] = set()
         
         for i, bomb in enumerate(self.bombs):
             explode_time = bomb.get('explode_time', 0)
@@ -1087,87 +1183,69 @@ class GameServer:
             if current_time >= explode_time:
                 bomb_x, bomb_y = bomb['pos']
                 
-                # 3x3 explosion area centered on bomb
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        explosion_x = bomb_x + dx
-                        explosion_y = bomb_y + dy
+                # 3x3 explosion area centered on bomb, clipped to the grid
+                explosion_cells = [
+                    (bomb_x + dx, bomb_y + dy)
+                    for dx in range(-1, 2)
+                    for dy in range(-1, 2)
+                    if 0 <= bomb_x + dx < self.grid_width and 0 <= bomb_y + dy < self.grid_height
+                ]
+                
+                # Check collision with snakes (one set intersection per snake)
+                for client_address, client_data in self.clients.items():
+                    if not client_data.get('alive', True):
+                        continue
+                    
+                    snake_set = client_data['snake_set']
+                    hits = snake_set.intersection(explosion_cells)
+                    if not hits:
+                        continue
+                    
+                    # The blast cuts the snake at the hit segment closest to the head
+                    snake = client_data['snake']
+                    hit_index = min(snake.index(pos) for pos in hits)
+                    
+                    # Check if it's a headshot (index 0)
+                    if hit_index == 0:
+                        # Kill the snake and clean up
+                        victim_name = client_data['player_name']
+                        victim_score = client_data.get('score', 0)
+                        thrower_name = bomb.get('thrower_name', 'Unknown')
+                        self.logger.info(f"💣 {thrower_name}'s bomb killed {victim_name} (Score: {victim_score})")
+                        client_data['alive'] = False
+                        client_data['bullets'] = 0
+                        client_data['bombs'] = 0
                         
-                        # Check bounds
-                        if (explosion_x < 0 or explosion_x >= self.grid_width or
-                            explosion_y < 0 or explosion_y >= self.grid_height):
-                            continue
+                        # Update statistics for killer and victim
+                        thrower_name = bomb.get('thrower_name', 'Unknown')
+                        if thrower_name != 'Unknown':
+                            self.update_player_stats(thrower_name, 0, kills=1)
+                            # Award 250 points to the killer
+                            for addr, data in self.clients.items():
+                                if data.get('player_name') == thrower_name:
+                                    data['score'] = data.get('score', 0) + 250
+                                    break
+                        self.update_player_stats(victim_name, victim_score, died=True)
                         
-                        explosion_pos = (explosion_x, explosion_y)
+                        # Remove snake from occupied cells
+                        self.occupied_cells.difference_update(snake_set)
+                        snake_set.clear()
+                    else:
+                        # Truncate snake after hit position
+                        # (pop from the tail - deques can't be sliced)
+                        removed_segments = [snake.pop() for _ in range(len(snake) - hit_index)]
                         
-                        # Check collision with snakes
-                        for client_address, client_data in self.clients.items():
-                            if not client_data.get('alive', True):
-                                continue
-                            
-                            snake = client_data.get('snake', [])
-                            if not snake:
-                                continue
-                            
-                            # Check if explosion hit this snake
-                            if explosion_pos in client_data.get('snake_set', set()):
-                                # Find the hit position in the snake
-                                hit_index = None
-                                for idx, segment in enumerate(snake):
-                                    if segment == explosion_pos:
-                                        hit_index = idx
-                                        break
-                                
-                                if hit_index is not None:
-                                    # Check if it's a headshot (index 0)
-                                    if hit_index == 0:
-                                        # Kill the snake and clean up
-                                        victim_name = client_data['player_name']
-                                        victim_score = client_data.get('score', 0)
-                                        thrower_name = bomb.get('thrower_name', 'Unknown')
-                                        self.logger.info(f"💣 {thrower_name}'s bomb killed {victim_name} (Score: {victim_score})")
-                                        client_data['alive'] = False
-                                        client_data['bullets'] = 0
-                                        client_data['bombs'] = 0
-                                        
-                                        # Update statistics for killer and victim
-                                        thrower_name = bomb.get('thrower_name', 'Unknown')
-                                        if thrower_name != 'Unknown':
-                                            self.update_player_stats(thrower_name, 0, kills=1)
-                                            # Award 250 points to the killer
-                                            for addr, data in self.clients.items():
-                                                if data.get('player_name') == thrower_name:
-                                                    data['score'] = data.get('score', 0) + 250
-                                                    break
-                                        self.update_player_stats(victim_name, victim_score, died=True)
-                                        
-                                        # Remove snake from occupied cells
-                                        snake_set = client_data.get('snake_set', set())
-                                        self.occupied_cells.difference_update(snake_set)
-                                        snake_set.clear()
-                                    else:
-                                        # Truncate snake after hit position
-                                        removed_segments = snake[hit_index:]
-                                        snake[:] = snake[:hit_index]
-                                        
-                                        # Update snake_set
-                                        snake_set = client_data.get('snake_set', set())
-                                        for seg in removed_segments:
-                                            snake_set.discard(seg)
-                                            self.occupied_cells.discard(seg)
-                                        
-                                        # Deduct score (50 points per removed segment)
-                                        score_deduction = len(removed_segments) * 50
-                                        client_data['score'] = max(0, client_data.get('score', 0) - score_deduction)
+                        # Update snake_set
+                        for seg in removed_segments:
+                            snake_set.discard(seg)
+                            self.occupied_cells.discard(seg)
+                        
+                        # Deduct score (50 points per removed segment)
+                        score_deduction = len(removed_segments) * 50
+                        client_data['score'] = max(0, client_data.get('score', 0) - score_deduction)
                 
                 # Create explosion animation (3x3 area, 0.4 second duration)
-                explosion_positions = []
-                for dx in range(-1, 2):
-                    for dy in range(-1, 2):
-                        exp_x = bomb_x + dx
-                        exp_y = bomb_y + dy
-                        if (0 <= exp_x < self.grid_width and 0 <= exp_y < self.grid_height):
-                            explosion_positions.append([exp_x, exp_y])
+                explosion_positions = [[exp_x, exp_y] for exp_x, exp_y in explosion_cells]
                 
                 self.explosions.append({
                     'positions': explosion_positions,
@@ -1175,12 +1253,11 @@ class GameServer:
                     'duration': 0.4  # 400ms animation
                 })
                 
-                bombs_to_remove.append(i)
+                bombs_to_remove.add(i)
         
         # Remove exploded bombs
-        for i in reversed(sorted(set(bombs_to_remove))):
-            if i < len(self.bombs):
-                self.bombs.pop(i)
+        if bombs_to_remove:
+            self.bombs[:] = [b for i, b in enumerate(self.bombs) if i not in bombs_to_remove]
     
     def update_explosions(self) -> None:
         """Remove expired explosion animations"""
@@ -1191,7 +1268,7 @@ class GameServer:
     def handle_ping(self, client_address: Tuple[str, int]) -> None:
         """Handle ping from client"""
         if client_address in self.clients:
-            self.clients[client_address]['last_seen'] = time.time()
+            self.clients[client_address]['last_seen'] = time.monotonic()
             
             # Send pong response
             pong_msg: Dict[str, Any] = {'type': 'pong', 'timestamp': time.time()}
@@ -1199,6 +1276,8 @@ class GameServer:
     
     def update_game_logic(self) -> None:
         """Update snake positions and check collisions"""
+        grid_width = self.grid_width
+        grid_height = self.grid_height
         
         for client_address, client_data in list(self.clients.items()):
             # Skip players not in active game
@@ -1209,28 +1288,23 @@ class GameServer:
                 continue
             
             snake = client_data['snake']
+            snake_set = client_data['snake_set']
             direction = client_data['direction']
             
             if not snake:
                 continue
             
-            head_x, head_y = snake[0]
-            
             # Calculate new head position
-            if direction == 'UP':
-                new_head = (head_x, head_y - 1)
-            elif direction == 'DOWN':
-                new_head = (head_x, head_y + 1)
-            elif direction == 'LEFT':
-                new_head = (head_x - 1, head_y)
-            elif direction == 'RIGHT':
-                new_head = (head_x + 1, head_y)
-            else:
+            delta = DIRECTION_DELTAS.get(direction)
+            if delta is None:
                 continue
+            head_x, head_y = snake[0]
+            new_x = head_x + delta[0]
+            new_y = head_y + delta[1]
+            new_head = (new_x, new_y)
             
             # Check collision with walls
-            if (new_head[0] < 0 or new_head[0] >= self.grid_width or
-                new_head[1] < 0 or new_head[1] >= self.grid_height):
+            if not (0 <= new_x < grid_width and 0 <= new_y < grid_height):
                 player_name = client_data['player_name']
                 final_score = client_data.get('score', 0)
                 self.logger.info(f"💥 {player_name} hit a wall (Score: {final_score})")
@@ -1238,39 +1312,35 @@ class GameServer:
                 client_data['bullets'] = 0
                 client_data['bombs'] = 0
                 self.update_player_stats(player_name, final_score, died=True)
+                # Remove snake from occupied cells
+                self.occupied_cells.difference_update(snake_set)
+                snake_set.clear()
                 continue
             
-            # Check collision with own snake via set membership
-            if new_head in client_data.get('snake_set', set()):
-                player_name = client_data['player_name']
-                final_score = client_data.get('score', 0)
-                self.logger.info(f"🔄 {player_name} collided with themselves (Score: {final_score})")
-                client_data['alive'] = False
-                client_data['bullets'] = 0
-                client_data['bombs'] = 0
-                self.update_player_stats(player_name, final_score, died=True)
-                continue
-            
-            # Check collision with other players' snakes using global occupied cells
+            # Check collision with any snake using global occupied cells. This holds every
+            # live segment including our own, so one lookup clears the common case and the
+            # owner only needs resolving when there is a hit.
             if new_head in self.occupied_cells:
-                # Collision with another snake - player dies
                 player_name = client_data['player_name']
                 final_score = client_data.get('score', 0)
-                self.logger.info(f"🐍 {player_name} collided with another snake (Score: {final_score})")
+                self_collision = new_head in snake_set
+                if self_collision:
+                    self.logger.info(f"🔄 {player_name} collided with themselves (Score: {final_score})")
+                else:
+                    self.logger.info(f"🐍 {player_name} collided with another snake (Score: {final_score})")
                 client_data['alive'] = False
                 client_data['bullets'] = 0
                 client_data['bombs'] = 0
                 self.update_player_stats(player_name, final_score, died=True)
                 # Remove snake from occupied cells
-                snake_set = client_data.get('snake_set', set())
                 self.occupied_cells.difference_update(snake_set)
                 snake_set.clear()
                 continue
             
             # Add new head
-            snake.insert(0, new_head)
+            snake.appendleft(new_head)
             # Update per-player set and global occupied
-            client_data.setdefault('snake_set', set()).add(new_head)
+            snake_set.add(new_head)
             self.occupied_cells.add(new_head)
             
             # Check if collected a brick
@@ -1283,168 +1353,183 @@ class GameServer:
                 # Bullet brick collected - remove tail (no growth, no bonus points)
                 tail = snake.pop()
                 # Update sets for tail removal
-                client_data.get('snake_set', set()).discard(tail)
+                snake_set.discard(tail)
                 self.occupied_cells.discard(tail)
             else:
                 # Normal movement (remove tail)
                 tail = snake.pop()
                 # Update sets for tail removal
-                client_data.get('snake_set', set()).discard(tail)
+                snake_set.discard(tail)
                 self.occupied_cells.discard(tail)
             
             # Increase score for each move
             client_data['score'] += 1
-            
-            self.clients[client_address]['snake'] = snake
     
-    def broadcast_game_state(self) -> None:
-        """Broadcast game state to all connected clients at 2Hz"""
-        while self.running:
-            if self.clients:
-                # Rebuild occupied_cells from alive players in game once per tick (safety sync)
-                occ: Set[Tuple[int, int]] = set()
-                for _addr, data in self.clients.items():
-                    if data.get('alive', True) and data.get('in_game', False):
-                        occ.update(data.get('snake_set', set()))
-                self.occupied_cells = occ
-                
-                # Update brick count based on player count
-                self.update_bricks()
-                
-                # Update bullets (move and check collisions)
-                self.update_bullets()
-                
-                # Update bombs (check timers and explosions)
-                self.update_bombs()
-                self.update_explosions()
-                
-                # Update game logic (move snakes, check collisions)
-                self.update_game_logic()
-                
-                # Update game state timestamp
-                self.game_state['timestamp'] = time.time()
-                self.game_state['game_time'] += self.broadcast_interval
-                
-                # Rebuild players sub-dict excluding non-serializable fields
-                players_snapshot: Dict[int, PlayerData] = {}
-                for client_address, client_data in self.clients.items():
-                    # Convert direction string to int for network efficiency
-                    direction_str = client_data.get('direction', 'RIGHT')
-                    direction_int = DIRECTION_TO_INT.get(direction_str, 3)  # Default to RIGHT
-                    
-                    # Optimize snake transmission: send head + length instead of all segments
-                    # This reduces a 50-segment snake from ~400 bytes to ~16 bytes
-                    snake = client_data.get('snake', [])
-                    if snake:
-                        # Send only head position and length
-                        # Client reconstructs snake based on direction and previous state
-                        snake_data = [snake[0], len(snake)]  # [head_position, length]
-                    else:
-                        snake_data = []
-                    
-                    # Build a filtered dict with only dynamic data (short keys for network efficiency)
-                    # Static data (name, color) is sent via metadata updates only
-                    # Removed: n (name), c (color), ca/ls (timestamps), ig (redundant)
-                    # Use short player ID (2-byte int) instead of full address string
-                    filtered: PlayerData = {
-                        's': snake_data,                          # snake (head + length only)
-                        'd': direction_int,                        # direction (int)
-                        'sc': client_data.get('score'),           # score
-                        'a': client_data.get('alive'),            # alive
-                        'bu': client_data.get('bullets', 0),      # bullets
-                        'bo': client_data.get('bombs', 0)         # bombs
-                    }
-                    player_id = hash_address_to_player_id(client_address)
-                    players_snapshot[player_id] = filtered
-                self.game_state['players'] = players_snapshot
-                
-                # Update bricks and bullets in game state
-                self.game_state['bricks'] = self.bricks.copy()
-                self.game_state['bullet_bricks'] = self.bullet_bricks.copy()
-                self.game_state['bomb_bricks'] = self.bomb_bricks.copy()
-                self.game_state['bullets'] = self.bullets.copy()
-                self.game_state['bombs'] = self.bombs.copy()
-                self.game_state['explosions'] = self.explosions.copy()
-                
-                # Leaderboard is now broadcast separately at a slower rate
-                
-                # Prepare broadcast message
-                broadcast_msg: Dict[str, Any] = {
-                    'message_count': self.mess_count,
-                    'type': 'game_state',
-                    'state': self.game_state
-                }
-                self.mess_count += 1
+    def verify_occupied_cells(self) -> None:
+        """Check occupied_cells against the live snakes and resync it on mismatch (debug aid)"""
+        expected: Set[Tuple[int, int]] = set()
+        for data in self.clients.values():
+            if data.get('alive', True) and data.get('in_game', False):
+                expected.update(data.get('snake_set', set()))
+        if expected != self.occupied_cells:
+            self.logger.error(f"occupied_cells out of sync: "
+                              f"{len(self.occupied_cells - expected)} stale, {len(expected - self.occupied_cells)} missing")
+            self.occupied_cells = expected
+    
+    def game_tick(self) -> None:
+        """Advance the game one step and broadcast the resulting state"""
+        if not self.clients:
+            return
+        
+        # occupied_cells is maintained incrementally by every move, death, respawn and leave
+        if VERIFY_OCCUPIED_CELLS:
+            self.verify_occupied_cells()
+        
+        # Update brick count based on player count
+        self.update_bricks()
+        
+        # Update bullets (move and check collisions)
+        self.update_bullets()
+        
+        # Update bombs (check timers and explosions)
+        self.update_bombs()
+        self.update_explosions()
+        
+        # Update game logic (move snakes, check collisions)
+        self.update_game_logic()
+        
+        # Update game state timestamp
+        self.game_state['timestamp'] = time.time()
+        self.game_state['game_time'] += self.broadcast_interval
+        
+        # Rebuild players sub-dict excluding non-serializable fields
+        players_snapshot: Dict[int, PlayerData] = {}
+        for client_address, client_data in self.clients.items():
+            # Convert direction string to int for network efficiency
+            direction_str = client_data.get('direction', 'RIGHT')
+            direction_int = DIRECTION_TO_INT.get(direction_str, 3)  # Default to RIGHT
+            
+            # Optimize snake transmission: send head + length instead of all segments
+            # This reduces a 50-segment snake from ~400 bytes to ~16 bytes
+            snake = client_data.get('snake', [])
+            if snake:
+                # Send only head position and length
+                # Client reconstructs snake based on direction and previous state
+                snake_data = [snake[0], len(snake)]  # [head_position, length]
+            else:
+                snake_data = []
+            
+            # Build a filtered dict with only dynamic data (short keys for network efficiency)
+            # Static data (name, color) is sent via metadata updates only
+            # Removed: n (name), c (color), ca/ls (timestamps), ig (redundant)
+            # Use short player ID (2-byte int) instead of full address string
+            filtered: PlayerData = {
+                's': snake_data,                          # snake (head + length only)
+                'd': direction_int,                        # direction (int)
+                'sc': client_data.get('score'),           # score
+                'a': client_data.get('alive'),            # alive
+                'bu': client_data.get('bullets', 0),      # bullets
+                'bo': client_data.get('bombs', 0)         # bombs
+            }
+            player_id = client_data.get('player_id')
+            if player_id is None:
+                player_id = client_data['player_id'] = hash_address_to_player_id(client_address)
+            players_snapshot[player_id] = filtered
+        self.game_state['players'] = players_snapshot
+        
+        # Update bricks and bullets in game state
+        # Shared by reference: the state is encoded below on this thread before anything
+        # mutates these lists again, so per-tick copies would only be garbage
+        self.game_state['bricks'] = self.bricks
+        self.game_state['bullet_bricks'] = self.bullet_bricks
+        self.game_state['bomb_bricks'] = self.bomb_bricks
+        self.game_state['bullets'] = self.bullets
+        self.game_state['bombs'] = self.bombs
+        self.game_state['explosions'] = self.explosions
+        
+        # Leaderboard is now broadcast separately at a slower rate
+        
+        # Prepare broadcast message
+        broadcast_msg: Dict[str, Any] = {
+            'message_count': self.mess_count,
+            'type': 'game_state',
+            'state': self.game_state
+        }
+        self.mess_count += 1
 
-                # Send only to clients that are in game
-                disconnected: List[Tuple[str, int]] = []
-                sent_count = 0
-                for client_address, client_data in self.clients.items():
-                    # Only send game state to clients actively in the game
-                    if not client_data.get('in_game', False):
-                        continue
-                    
-                    try:
-                        # Use the game socket address for this control address
-                        game_address = self.game_addresses.get(client_address)
-                        
-                        if game_address:
-                            # Send to the registered game socket address
-                            self.send_to_client(game_address, broadcast_msg, use_game_socket=True)
-                            sent_count += 1
-                        else:
-                            # Client hasn't sent any game messages yet, skip
-                            pass
-                    except Exception as e:
-                        self.logger.error(f"Error sending to {client_address}: {e}")
-                        disconnected.append(client_address)
-                
-                # Remove disconnected clients
-                for client_address in disconnected:
-                    self.handle_disconnect(client_address)
-                
-                # Check for inactive clients (timeout after 10 seconds)
-                current_time: float = time.time()
-                inactive: List[Tuple[str, int]] = []
-                for client_address, client_data in self.clients.items():
-                    if current_time - client_data['last_seen'] > 10:
-                        inactive.append(client_address)
-                
-                for client_address in inactive:
-                    player_name = self.clients[client_address].get('player_name', 'Unknown')
-                    self.logger.warning(f"Client timeout: {player_name} ({client_address[0]})")
-                    self.handle_disconnect(client_address)
+        # Serialize once per tick - every in-game client receives identical bytes
+        payload = self.encode_message(broadcast_msg)
+        
+        # Single pass: time out inactive clients (after 10 seconds) and send to the rest
+        # of the clients that are in game. last_seen is monotonic so a wall clock step
+        # (NTP, DST) can't time everyone out at once
+        current_time: float = time.monotonic()
+        disconnected: List[Tuple[str, int]] = []
+        inactive: List[Tuple[str, int]] = []
+        sent_count = 0
+        for client_address, client_data in self.clients.items():
+            if current_time - client_data['last_seen'] > 10:
+                inactive.append(client_address)
+                continue
             
-            time.sleep(self.broadcast_interval)
-    
-    def broadcast_leaderboard(self) -> None:
-        """Broadcast leaderboard separately at slower rate (0.2Hz / every 5 seconds)"""
-        leaderboard_interval = 5.0  # 5 seconds between leaderboard updates
-        
-        while self.running:
-            if self.clients:
-                # Prepare leaderboard message
-                leaderboard_msg: Dict[str, Any] = {
-                    'type': 'leaderboard',
-                    'leaderboard': self.get_top_players(10),
-                    'all_time_highscore': self.stats['all_time_highscore'],
-                    'all_time_highscore_player': self.stats['all_time_highscore_player']
-                }
-                
-                # Send to all clients (both in-game and lobby)
-                for client_address, client_data in self.clients.items():
-                    try:
-                        # Use game socket address if available, otherwise control socket
-                        game_address = self.game_addresses.get(client_address)
-                        if game_address:
-                            self.send_to_client(game_address, leaderboard_msg, use_game_socket=True)
-                        else:
-                            # Client hasn't registered game address yet, use control socket
-                            self.send_to_client(client_address, leaderboard_msg, use_game_socket=False)
-                    except Exception as e:
-                        self.logger.error(f"Error sending leaderboard to {client_address}: {e}")
+            # Only send game state to clients actively in the game
+            if not client_data.get('in_game', False):
+                continue
             
-            time.sleep(leaderboard_interval)
+            try:
+                # Use the game socket address for this control address
+                game_address = self.game_addresses.get(client_address)
+                
+                if game_address:
+                    # Send to the registered game socket address
+                    self.send_raw(game_address, payload, use_game_socket=True)
+                    sent_count += 1
+                else:
+                    # Client hasn't sent any game messages yet, skip
+                    pass
+            except BlockingIOError:
+                # Our send buffer is full - skip this client for one tick, it is not gone
+                self.logger.debug(f"Send buffer full, dropped game state for {client_address}")
+            except Exception as e:
+                self.logger.error(f"Error sending to {client_address}: {e}")
+                disconnected.append(client_address)
+        
+        # Remove disconnected clients
+        for client_address in disconnected:
+            self.handle_disconnect(client_address)
+        
+        for client_address in inactive:
+            player_name = self.clients[client_address].get('player_name', 'Unknown')
+            self.logger.warning(f"Client timeout: {player_name} ({client_address[0]})")
+            self.handle_disconnect(client_address)
+    
+    def send_leaderboard(self) -> None:
+        """Send the current leaderboard to every connected client"""
+        if not self.clients:
+            return
+        
+        # Prepare leaderboard message
+        leaderboard_msg: Dict[str, Any] = {
+            'type': 'leaderboard',
+            'leaderboard': self.get_top_players(10),
+            'all_time_highscore': self.stats['all_time_highscore'],
+            'all_time_highscore_player': self.stats['all_time_highscore_player']
+        }
+        
+        leaderboard_payload = self.encode_message(leaderboard_msg)
+        
+        # Send to all clients (both in-game and lobby)
+        for client_address, client_data in self.clients.items():
+            try:
+                # Use game socket address if available, otherwise control socket
+                game_address = self.game_addresses.get(client_address)
+                if game_address:
+                    self.send_raw(game_address, leaderboard_payload, use_game_socket=True)
+                else:
+                    # Client hasn't registered game address yet, use control socket
+                    self.send_raw(client_address, leaderboard_payload, use_game_socket=False)
+            except Exception as e:
+                self.logger.error(f"Error sending leaderboard to {client_address}: {e}")
     
     def send_to_client(self, client_address: Tuple[str, int], message: Dict[str, Any], use_game_socket: bool = False) -> None:
         """Send message to specific client
@@ -1454,21 +1539,60 @@ class GameServer:
             message: Message to send
             use_game_socket: If True, use game socket (port 50001), otherwise use control socket (port 50000)
         """
+        self.send_raw(client_address, self.encode_message(message), use_game_socket)
+    
+    def encode_message(self, message: Dict[str, Any]) -> bytes:
+        """Serialize a message for the wire
+        
+        Args:
+            message: Message to serialize
+            
+        Returns:
+            Encoded bytes (MessagePack if available, otherwise JSON)
+        """
         # Use MessagePack if available (40-60% smaller), otherwise fallback to JSON
         if MSGPACK_AVAILABLE:
-            data = msgpack.packb(message, use_bin_type=True)
-        else:
-            data = json.dumps(message).encode('utf-8')
+            return msgpack.packb(message, use_bin_type=True)
+        return _json_dumps(message)
+    
+    def decode_message(self, data: Buffer) -> Optional[Dict[str, Any]]:
+        """Deserialize a message received from a client
         
+        Args:
+            data: Raw datagram payload (bytes or a memoryview of the receive buffer)
+            
+        Returns:
+            Decoded message (tries MessagePack first, falls back to JSON)
+        """
+        if MSGPACK_AVAILABLE:
+            try:
+                return msgpack.unpackb(data, raw=False)
+            except msgpack.exceptions.ExtraData:
+                # JSON text parses as a msgpack int followed by extra data
+                pass
+        return _json_loads(data)
+    
+    def send_raw(self, client_address: Tuple[str, int], payload: bytes, use_game_socket: bool = False) -> None:
+        """Send already-encoded bytes to a client
+        
+        Used by the broadcasts so a message shared by many clients is only serialized once.
+        Both sockets are non-blocking, so a full send buffer raises BlockingIOError.
+        
+        Args:
+            client_address: Client address tuple
+            payload: Encoded message from encode_message()
+            use_game_socket: If True, use game socket (port 50001), otherwise use control socket (port 50000)
+        """
         if use_game_socket:
-            self.game_socket.sendto(data, client_address)
+            self.game_socket.sendto(payload, client_address)
         else:
-            self.control_socket.sendto(data, client_address)
+            self.control_socket.sendto(payload, client_address)
     
     def stop(self) -> None:
         """Stop the server"""
         self.logger.info("Shutting down server...")
         self.running = False
+        self.flush_stats()
         self.control_socket.close()
         self.game_socket.close()
         self.logger.info("Server stopped")
@@ -13,6 +13,7 @@ Tests verify that:
 """
 
 import unittest
+from collections import deque
 import time
 from typing import Dict, Any, Tuple
 from unittest.mock import patch, MagicMock
@@ -38,7 +39,7 @@ class TestBombFeature(unittest.TestCase):
         # Initialize player 1 (thrower)
         self.server.clients[self.player1_addr] = {
             'player_name': 'BombThrower',
-            'snake': [(20, 15), (20, 16), (20, 17)],
+            'snake': deque([(20, 15), (20, 16), (20, 17)]),
             'snake_set': {(20, 15), (20, 16), (20, 17)},
             'direction': 'UP',
             'score': 500,
@@ -53,7 +54,7 @@ class TestBombFeature(unittest.TestCase):
         # Initialize player 2 (victim - will be in explosion range)
         self.server.clients[self.player2_addr] = {
             'player_name': 'VictimPlayer',
-            'snake': [(25, 15), (25, 16), (25, 17), (25, 18), (25, 19)],
+            'snake': deque([(25, 15), (25, 16), (25, 17), (25, 18), (25, 19)]),
             'snake_set': {(25, 15), (25, 16), (25, 17), (25, 18), (25, 19)},
             'direction': 'DOWN',
             'score': 300,
@@ -68,7 +69,7 @@ class TestBombFeature(unittest.TestCase):
         # Initialize player 3 (safe distance - outside explosion range)
         self.server.clients[self.player3_addr] = {
             'player_name': 'SafePlayer',
-            'snake': [(30, 15), (30, 16), (30, 17)],
+            'snake': deque([(30, 15), (30, 16), (30, 17)]),
             'snake_set': {(30, 15), (30, 16), (30, 17)},
             'direction': 'DOWN',
             'score': 200,
@@ -124,6 +125,25 @@ class TestBombFeature(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(self.server.bricks), initial_bricks + 1)
 
+    def test_spawn_brick_on_crowded_grid(self):
+        """Test that a brick still spawns when only one cell is free"""
+        free_cell = (7, 3)
+        self.server.occupied_cells = {
+            (x, y)
+            for x in range(self.server.grid_width)
+            for y in range(self.server.grid_height)
+        } - {free_cell}
+        self.server.bricks, self.server.bricks_set = [], set()
+        self.server.bullet_bricks, self.server.bullet_bricks_set = [], set()
+        self.server.bomb_bricks, self.server.bomb_bricks_set = [], set()
+        
+        self.assertTrue(self.server.spawn_brick())
+        spawned = self.server.bricks_set | self.server.bullet_bricks_set | self.server.bomb_bricks_set
+        self.assertEqual(spawned, {free_cell})
+        
+        # Grid is now completely full
+        self.assertFalse(self.server.spawn_brick())
+
     def test_collect_bomb_brick(self):
         """Test that collecting a bomb brick increases bomb count by 1"""
         initial_bombs = self.server.clients[self.player1_addr]['bombs']
@@ -295,7 +315,7 @@ class TestBombFeature(unittest.TestCase):
         remaining_snake = self.server.clients[self.player2_addr]['snake']
         self.assertEqual(len(remaining_snake), 1,
                         "Snake should be truncated to 1 segment")
-        self.assertEqual(remaining_snake, [(25, 15)])
+        self.assertEqual(list(remaining_snake), [(25, 15)])
         
         # Verify score was deducted (50 points per removed segment)
         # 4 segments removed: (25, 16), (25, 17), (25, 18), (25, 19)
@@ -335,11 +355,11 @@ class TestBombFeature(unittest.TestCase):
         # Bomb at (24, 15), 3x3 area: (23,14) to (25,16)
         
         # Position player2's head at (25, 15) - inside range
-        self.server.clients[self.player2_addr]['snake'] = [(25, 15), (25, 16)]
+        self.server.clients[self.player2_addr]['snake'] = deque([(25, 15), (25, 16)])
         self.server.clients[self.player2_addr]['snake_set'] = {(25, 15), (25, 16)}
         
         # Position player3's head at (23, 15) - also inside range
-        self.server.clients[self.player3_addr]['snake'] = [(23, 15), (23, 16)]
+        self.server.clients[self.player3_addr]['snake'] = deque([(23, 15), (23, 16)])
         self.server.clients[self.player3_addr]['snake_set'] = {(23, 15), (23, 16)}
         
         bomb_pos = [24, 15]
@@ -391,7 +411,7 @@ class TestBombFeature(unittest.TestCase):
         explode_time = time.time() - 0.1
         
         # Place a snake at (1, 1) which is within range
-        self.server.clients[self.player2_addr]['snake'] = [(1, 1), (1, 2)]
+        self.server.clients[self.player2_addr]['snake'] = deque([(1, 1), (1, 2)])
         self.server.clients[self.player2_addr]['snake_set'] = {(1, 1), (1, 2)}
         
         bomb: Dict[str, Any] = {
@@ -488,9 +508,9 @@ class TestBombFeature(unittest.TestCase):
     def test_explosion_snake_set_consistency(self):
         """Test that snake_set is properly updated after explosion truncation"""
         # Setup: Player2 with snake at specific positions
-        self.server.clients[self.player2_addr]['snake'] = [
+        self.server.clients[self.player2_addr]['snake'] = deque([
             (25, 15), (25, 16), (25, 17), (25, 18), (25, 19)
-        ]
+        ])
         self.server.clients[self.player2_addr]['snake_set'] = {
             (25, 15), (25, 16), (25, 17), (25, 18), (25, 19)
         }
@@ -542,7 +562,8 @@ class TestBombFeature(unittest.TestCase):
         """Test that bombs are thrown left or right (perpendicular) when snake is facing UP"""
         # Set player facing UP at position (20, 15)
         self.server.clients[self.player1_addr]['direction'] = 'UP'
-        self.server.clients[self.player1_addr]['snake'] = [(20, 15), (20, 16), (20, 17)]
+        self.server.clients[self.player1_addr]['snake'] = deque([(20, 15), (20, 16), (20, 17)])
+        self.server.clients[self.player1_addr]['snake_set'] = {(20, 15), (20, 16), (20, 17)}
         self.server.clients[self.player1_addr]['bombs'] = 1
         
         # Throw bomb
@@ -567,7 +588,8 @@ class TestBombFeature(unittest.TestCase):
         """Test that bombs are thrown left or right (perpendicular) when snake is facing DOWN"""
         # Set player facing DOWN
         self.server.clients[self.player1_addr]['direction'] = 'DOWN'
-        self.server.clients[self.player1_addr]['snake'] = [(20, 15), (20, 14), (20, 13)]
+        self.server.clients[self.player1_addr]['snake'] = deque([(20, 15), (20, 14), (20, 13)])
+        self.server.clients[self.player1_addr]['snake_set'] = {(20, 15), (20, 14), (20, 13)}
         self.server.clients[self.player1_addr]['bombs'] = 1
         
         # Throw bomb
@@ -591,7 +613,8 @@ class TestBombFeature(unittest.TestCase):
         """Test that bombs are thrown up or down (perpendicular) when snake is facing LEFT"""
         # Set player facing LEFT
         self.server.clients[self.player1_addr]['direction'] = 'LEFT'
-        self.server.clients[self.player1_addr]['snake'] = [(20, 15), (21, 15), (22, 15)]
+        self.server.clients[self.player1_addr]['snake'] = deque([(20, 15), (21, 15), (22, 15)])
+        self.server.clients[self.player1_addr]['snake_set'] = {(20, 15), (21, 15), (22, 15)}
         self.server.clients[self.player1_addr]['bombs'] = 1
         
         # Throw bomb
@@ -615,7 +638,8 @@ class TestBombFeature(unittest.TestCase):
         """Test that bombs are thrown up or down (perpendicular) when snake is facing RIGHT"""
         # Set player facing RIGHT
         self.server.clients[self.player1_addr]['direction'] = 'RIGHT'
-        self.server.clients[self.player1_addr]['snake'] = [(20, 15), (19, 15), (18, 15)]
+        self.server.clients[self.player1_addr]['snake'] = deque([(20, 15), (19, 15), (18, 15)])
+        self.server.clients[self.player1_addr]['snake_set'] = {(20, 15), (19, 15), (18, 15)}
         self.server.clients[self.player1_addr]['bombs'] = 1
         
         # Throw bomb
@@ -651,7 +675,8 @@ class TestBombFeature(unittest.TestCase):
                 
                 # Set player direction and position
                 self.server.clients[self.player1_addr]['direction'] = direction
-                self.server.clients[self.player1_addr]['snake'] = [(head_x, head_y), (head_x, head_y + 1), (head_x, head_y + 2)]
+                self.server.clients[self.player1_addr]['snake'] = deque([(head_x, head_y), (head_x, head_y + 1), (head_x, head_y + 2)])
+                self.server.clients[self.player1_addr]['snake_set'] = {(head_x, head_y), (head_x, head_y + 1), (head_x, head_y + 2)}
                 self.server.clients[self.player1_addr]['bombs'] = 1
                 
                 # Throw bomb
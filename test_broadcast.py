@@ -0,0 +1,119 @@
+"""
+Unit tests for game state broadcasting and message encoding.
+
+Tests verify that:
+1. The game state is serialized once per tick, not once per client
+2. Every in-game client receives the same encoded payload on the game socket
+3. Clients in the lobby do not receive game state
+4. Timed-out clients are dropped in the same pass and not sent to
+5. A full send buffer skips the client without disconnecting it
+6. Encoded messages decode back unchanged, and JSON from old clients is still accepted
+"""
+
+import unittest
+from collections import deque
+from unittest.mock import patch
+from server import GameServer
+
+
+class TestBroadcast(unittest.TestCase):
+    """Test cases for the game state broadcast at the end of each tick"""
+
+    def setUp(self):
+        """Set up a game server instance for testing"""
+        # Mock socket before creating server to prevent binding
+        with patch('socket.socket'):
+            self.server = GameServer(port=50003)  # Use different port for testing
+
+        self.server.running = True
+
+        # Two in-game players and one in the lobby
+        self.addresses = [("127.0.0.1", 10001), ("127.0.0.1", 10002), ("127.0.0.1", 10003)]
+        for i, addr in enumerate(self.addresses):
+            in_game = i < 2
+            self.server.clients[addr] = {
+                'player_name': f'Player{i}',
+                'snake': deque([(10 + i * 10, 10), (10 + i * 10, 11)] if in_game else []),
+                'snake_set': {(10 + i * 10, 10), (10 + i * 10, 11)} if in_game else set(),
+                'direction': 'UP',
+                'score': 0,
+                'alive': in_game,
+                'bullets': 0,
+                'bombs': 0,
+                'in_game': in_game,
+                'last_seen': float('inf')
+            }
+            self.server.game_addresses[addr] = (addr[0], addr[1] + 1000)
+
+    def test_game_state_encoded_once_per_tick(self):
+        """Test that the broadcast serializes the game state once for all clients"""
+        with patch.object(self.server, 'encode_message', wraps=self.server.encode_message) as encode:
+            self.server.game_tick()
+
+        game_state_calls = [c for c in encode.call_args_list if c.args[0].get('type') == 'game_state']
+        self.assertEqual(len(game_state_calls), 1)
+
+    def test_in_game_clients_receive_same_payload(self):
+        """Test that every in-game client gets identical bytes on the game socket"""
+        self.server.game_tick()
+
+        sendto = self.server.game_socket.sendto
+        self.assertEqual(sendto.call_count, 2)
+        payloads = {c.args[0] for c in sendto.call_args_list}
+        destinations = {c.args[-1] for c in sendto.call_args_list}
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(destinations, {self.server.game_addresses[a] for a in self.addresses[:2]})
+
+    def test_inactive_client_timed_out_without_send(self):
+        """Test that a timed-out client is disconnected and not sent the state"""
+        timed_out = self.addresses[0]
+        self.server.clients[timed_out]['last_seen'] = 0
+
+        self.server.game_tick()
+
+        self.assertNotIn(timed_out, self.server.clients)
+        destinations = [c.args[-1] for c in self.server.game_socket.sendto.call_args_list]
+        self.assertEqual(destinations, [self.server.game_addresses[self.addresses[1]]])
+
+    def test_full_send_buffer_does_not_disconnect(self):
+        """Test that a would-block send skips the client without dropping it"""
+        self.server.game_socket.sendto.side_effect = BlockingIOError
+
+        self.server.game_tick()
+
+        for addr in self.addresses:
+            self.assertIn(addr, self.server.clients)
+
+
+class TestMessageCodec(unittest.TestCase):
+    """Test cases for encode_message / decode_message"""
+
+    def setUp(self):
+        """Set up a game server instance for testing"""
+        with patch('socket.socket'):
+            self.server = GameServer(port=50003)
+
+    def test_round_trip(self):
+        """Test that an encoded message decodes back to the same dict"""
+        message = {'type': 'update', 'player_id': 1234, 'data': {'direction': 'UP'}}
+        self.assertEqual(self.server.decode_message(self.server.encode_message(message)), message)
+
+    def test_decode_json(self):
+        """Test that plain JSON datagrams are decoded regardless of msgpack support"""
+        self.assertEqual(self.server.decode_message(b'{"type":"ping"}'), {'type': 'ping'})
+
+    def test_decode_memoryview(self):
+        """Test that a slice of the receive buffer decodes like bytes"""
+        buffer = bytearray(64)
+        data = b'{"type":"ping"}'
+        buffer[:len(data)] = data
+        self.assertEqual(self.server.decode_message(memoryview(buffer)[:len(data)]), {'type': 'ping'})
+
+    def test_decode_invalid(self):
+        """Test that garbage raises ValueError so the listeners can skip it"""
+        with self.assertRaises(ValueError):
+            self.server.decode_message(b'{not json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ Tests verify that:
 """
 
 import unittest
+from collections import deque
 from typing import Dict, Any
 from unittest.mock import patch, MagicMock
 from server import GameServer
@@ -31,7 +32,7 @@ class TestBulletReset(unittest.TestCase):
         # Initialize player 1
         self.server.clients[self.player1_addr] = {
             'player_name': 'TestPlayer1',
-            'snake': [(10, 10), (10, 11), (10, 12)],
+            'snake': deque([(10, 10), (10, 11), (10, 12)]),
             'snake_set': {(10, 10), (10, 11), (10, 12)},
             'direction': 'UP',
             'score': 500,
@@ -45,7 +46,7 @@ class TestBulletReset(unittest.TestCase):
         # Initialize player 2
         self.server.clients[self.player2_addr] = {
             'player_name': 'TestPlayer2',
-            'snake': [(20, 20), (20, 21), (20, 22)],
+            'snake': deque([(20, 20), (20, 21), (20, 22)]),
             'snake_set': {(20, 20), (20, 21), (20, 22)},
             'direction': 'DOWN',
             'score': 300,
@@ -111,7 +112,7 @@ class TestBulletReset(unittest.TestCase):
         self.assertTrue(self.server.clients[self.player1_addr]['alive'])
         
         # Move player 1 towards the top wall
-        self.server.clients[self.player1_addr]['snake'] = [(0, 0)]  # At edge
+        self.server.clients[self.player1_addr]['snake'] = deque([(0, 0)])  # At edge
         self.server.clients[self.player1_addr]['snake_set'] = {(0, 0)}
         self.server.clients[self.player1_addr]['direction'] = 'UP'  # Moving towards wall
         
@@ -133,7 +134,7 @@ class TestBulletReset(unittest.TestCase):
         
         # Create a snake that will collide with itself on next move
         # Snake at (5,5) moving RIGHT will hit (6,5) which is in the body
-        self.server.clients[self.player1_addr]['snake'] = [(5, 5), (4, 5), (3, 5), (3, 6), (4, 6), (5, 6), (6, 6), (6, 5)]
+        self.server.clients[self.player1_addr]['snake'] = deque([(5, 5), (4, 5), (3, 5), (3, 6), (4, 6), (5, 6), (6, 6), (6, 5)])
         self.server.clients[self.player1_addr]['snake_set'] = {(5, 5), (4, 5), (3, 5), (3, 6), (4, 6), (5, 6), (6, 6), (6, 5)}
         self.server.clients[self.player1_addr]['direction'] = 'RIGHT'  # Will hit (6, 5) which is in snake_set
         
@@ -147,6 +148,44 @@ class TestBulletReset(unittest.TestCase):
         self.assertFalse(self.server.clients[self.player1_addr]['alive'])
         self.assertEqual(self.server.clients[self.player1_addr]['bullets'], 0)
 
+    def test_body_shot_keeps_bullets(self):
+        """Test that a body shot truncates the snake but doesn't reset bullets"""
+        # Bullet flies up from (10, 14), passing empty cell (10, 13) before hitting (10, 12)
+        bullet: Dict[str, Any] = {
+            'pos': [10, 14],
+            'direction': 'UP',
+            'owner': str(self.player2_addr),
+            'shooter_name': 'TestPlayer2'
+        }
+        self.server.bullets = [bullet]
+        
+        self.server.update_bullets()
+        
+        # Tail segment removed, player alive with bullets intact, bullet consumed
+        self.assertTrue(self.server.clients[self.player1_addr]['alive'])
+        self.assertEqual(self.server.clients[self.player1_addr]['bullets'], 5)
+        self.assertEqual(list(self.server.clients[self.player1_addr]['snake']), [(10, 10), (10, 11)])
+        self.assertNotIn((10, 12), self.server.occupied_cells)
+        self.assertEqual(self.server.bullets, [])
+
+    def test_bullets_reset_on_other_snake_collision(self):
+        """Test that bullets are reset to 0 when player runs into another snake"""
+        # Player 1 at (19, 21) moving RIGHT will hit player 2's body at (20, 21)
+        self.server.clients[self.player1_addr]['snake'] = deque([(19, 21), (18, 21)])
+        self.server.clients[self.player1_addr]['snake_set'] = {(19, 21), (18, 21)}
+        self.server.clients[self.player1_addr]['direction'] = 'RIGHT'
+        self.server.clients[self.player2_addr]['direction'] = 'UP'
+        self.server.occupied_cells = {(19, 21), (18, 21), (20, 20), (20, 21), (20, 22)}
+        
+        # Process game logic (will detect collision with player 2)
+        self.server.update_game_logic()
+        
+        # Verify player 1 is dead, bullets are reset and its cells are freed
+        self.assertFalse(self.server.clients[self.player1_addr]['alive'])
+        self.assertEqual(self.server.clients[self.player1_addr]['bullets'], 0)
+        self.assertNotIn((19, 21), self.server.occupied_cells)
+        self.assertIn((20, 21), self.server.occupied_cells)
+
     @patch('random.randint')
     def test_bullets_reset_on_respawn(self, mock_randint: MagicMock) -> None:
         """Test that bullets are reset to 0 when player respawns"""
@@ -172,6 +211,29 @@ class TestBulletReset(unittest.TestCase):
         self.assertEqual(self.server.clients[self.player1_addr]['bullets'], 0)
         self.assertEqual(self.server.clients[self.player1_addr]['score'], 250)  # Half of 500
 
+    @patch('random.randint')
+    def test_respawn_avoids_occupied_cell(self, mock_randint: MagicMock) -> None:
+        """Test that a respawn landing on another snake is moved to a free cell"""
+        # Random position lands on player 2's head
+        mock_randint.side_effect = [20, 20]
+        self.server.clients[self.player1_addr]['alive'] = False
+        
+        self.server.handle_player_update(self.player1_addr, {'type': 'player_update', 'data': {'respawn': True}})
+        
+        head = self.server.clients[self.player1_addr]['snake'][0]
+        self.assertNotEqual(head, (20, 20))
+        self.assertNotIn(head, self.server.clients[self.player2_addr]['snake_set'])
+        self.assertIn(head, self.server.occupied_cells)
+
+    def test_respawn_ignored_in_lobby(self):
+        """Test that a respawn request from a lobby player doesn't put a snake on the grid"""
+        self.server.clients[self.player1_addr]['alive'] = False
+        self.server.clients[self.player1_addr]['in_game'] = False
+        
+        self.server.handle_player_update(self.player1_addr, {'type': 'player_update', 'data': {'respawn': True}})
+        
+        self.assertFalse(self.server.clients[self.player1_addr]['alive'])
+
     def test_bullets_dont_swap_between_players(self):
         """Test that bullet counts remain independent between players"""
         # Initial state
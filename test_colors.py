@@ -0,0 +1,49 @@
+"""
+Unit tests for player color allocation.
+
+Tests verify that:
+1. Colors are handed out lowest index first
+2. A released color is reused before later colors
+3. Allocation fails cleanly once every color is taken
+"""
+
+import unittest
+from unittest.mock import patch
+from server import GameServer
+
+
+class TestColorAllocation(unittest.TestCase):
+    """Test cases for the color bitmask allocator"""
+
+    def setUp(self):
+        """Set up a game server instance for testing"""
+        # Mock socket before creating server to prevent binding
+        with patch('socket.socket'):
+            self.server = GameServer(port=50004)  # Use different port for testing
+
+    def test_allocates_in_order(self):
+        """Test that colors are allocated in pool order"""
+        colors = self.server.available_colors
+        self.assertEqual(self.server.allocate_color(), colors[0])
+        self.assertEqual(self.server.allocate_color(), colors[1])
+        self.assertEqual(self.server.color_mask, 0b11)
+
+    def test_released_color_is_reused(self):
+        """Test that a released color is the next one handed out"""
+        colors = self.server.available_colors
+        for _ in range(3):
+            self.server.allocate_color()
+
+        self.server.release_color(colors[1])
+        self.assertEqual(self.server.allocate_color(), colors[1])
+        self.assertEqual(self.server.allocate_color(), colors[3])
+
+    def test_pool_exhausted(self):
+        """Test that None is returned when all colors are in use"""
+        allocated = [self.server.allocate_color() for _ in self.server.available_colors]
+        self.assertEqual(len(set(allocated)), len(self.server.available_colors))
+        self.assertIsNone(self.server.allocate_color())
+
+
+if __name__ == '__main__':
+    unittest.main()
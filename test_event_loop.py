@@ -0,0 +1,195 @@
+"""
+Unit tests for the single-threaded server event loop.
+
+Tests verify that:
+1. drain_socket hands every queued datagram to the handler and stops when the socket is empty
+2. A failing handler doesn't stop the remaining datagrams from being handled
+3. Control datagrams are decoded and dispatched, and garbage is dropped
+4. Messages are routed to the handler for their type
+5. Automatic garbage collection is restored and pending stats are saved when the loop exits
+6. Ticks run every broadcast_interval, an overrun starts a fresh schedule, and the
+   leaderboard goes out every LEADERBOARD_INTERVAL
+7. A failing tick is logged without ending the loop
+"""
+
+import gc
+import unittest
+from unittest.mock import patch, MagicMock
+from server import GameServer, MAX_DATAGRAMS_PER_READ, LEADERBOARD_INTERVAL
+
+
+class TestEventLoop(unittest.TestCase):
+    """Test cases for datagram draining and dispatch"""
+
+    def setUp(self):
+        """Set up a game server instance for testing"""
+        # Mock socket before creating server to prevent binding
+        with patch('socket.socket'):
+            self.server = GameServer(port=50005)  # Use different port for testing
+
+        self.addr = ("127.0.0.1", 10001)
+        self.sock = MagicMock()
+
+    def queue_datagrams(self, *datagrams):
+        """Make the mock socket return the given datagrams, then would-block"""
+        pending = list(datagrams)
+
+        def recvfrom_into(buffer):
+            if not pending:
+                raise BlockingIOError
+            data = pending.pop(0)
+            buffer[:len(data)] = data
+            return len(data), self.addr
+        self.sock.recvfrom_into.side_effect = recvfrom_into
+
+    def test_drain_until_would_block(self):
+        """Test that all queued datagrams are handled in one wakeup"""
+        received = []
+        self.queue_datagrams(b'first', b'b')
+
+        self.server.drain_socket(self.sock, lambda data, addr: received.append(bytes(data)))
+
+        self.assertEqual(received, [b'first', b'b'])
+
+    def test_drain_is_capped(self):
+        """Test that a flooded socket yields back to the loop after the cap"""
+        self.queue_datagrams(*[b'x'] * (MAX_DATAGRAMS_PER_READ + 10))
+        handler = MagicMock()
+
+        self.server.drain_socket(self.sock, handler)
+
+        self.assertEqual(handler.call_count, MAX_DATAGRAMS_PER_READ)
+
+    def test_handler_error_does_not_stop_drain(self):
+        """Test that an exception in one handler call is logged and skipped"""
+        self.queue_datagrams(b'a', b'b')
+        handler = MagicMock(side_effect=[RuntimeError("boom"), None])
+
+        self.server.drain_socket(self.sock, handler)
+
+        self.assertEqual(handler.call_count, 2)
+
+    def test_control_datagram_dispatch(self):
+        """Test that a ping on the control socket reaches handle_client_message"""
+        with patch.object(self.server, 'handle_client_message') as handle:
+            self.server.handle_control_datagram(self.server.encode_message({'type': 'ping'}), self.addr)
+            self.server.handle_control_datagram(memoryview(b'{broken'), self.addr)
+
+        handle.assert_called_once_with(self.addr, {'type': 'ping'})
+
+    def test_message_type_dispatch(self):
+        """Test that each message type reaches its handler and unknown types are ignored"""
+        with patch.object(self.server, 'handle_shoot') as shoot, \
+                patch.object(self.server, 'handle_throw_bomb') as throw_bomb:
+            self.server.handle_client_message(self.addr, {'type': 'shoot'})
+            self.server.handle_client_message(self.addr, {'type': 'bogus'})
+            self.server.handle_client_message(self.addr, {})
+
+        shoot.assert_called_once_with(self.addr)
+        throw_bomb.assert_not_called()
+
+    def test_gc_restored_after_loop(self):
+        """Test that the event loop turns automatic GC back on when it returns"""
+        self.server.running = False
+        with patch('server.selectors.DefaultSelector'):
+            self.server.run_event_loop()
+
+        self.assertTrue(gc.isenabled())
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_pending_stats_saved_on_exit(self):
+        """Test that stats changed since the last flush are saved when the loop ends"""
+        self.server.running = False
+        self.server.stats_dirty = True
+        with patch('server.selectors.DefaultSelector'), \
+                patch.object(self.server, 'save_stats') as save_stats:
+            self.server.run_event_loop()
+
+        save_stats.assert_called_once()
+
+
+class TestEventLoopScheduling(unittest.TestCase):
+    """Test cases for tick and leaderboard timing in run_event_loop"""
+
+    def setUp(self):
+        """Set up a server whose selector waits on a fake monotonic clock"""
+        with patch('socket.socket'):
+            self.server = GameServer(port=50005)
+
+        self.server.running = True
+        self.clock = [100.0]
+        self.tick_times = []
+        self.tick_duration = 0.0
+
+        # select() "waits" by advancing the clock by its timeout; nothing is ever readable
+        def select(timeout):
+            self.clock[0] += timeout
+            return []
+        selector = MagicMock()
+        selector.select.side_effect = select
+
+        for patcher in (
+            patch('server.selectors.DefaultSelector', return_value=selector),
+            patch('server.time.monotonic', side_effect=lambda: self.clock[0]),
+            patch('server.gc.collect'),
+            patch.object(self.server, 'game_tick', side_effect=self.record_tick),
+            patch.object(self.server, 'send_leaderboard'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def record_tick(self):
+        """Record when a tick starts, spend tick_duration on it and stop after a few ticks"""
+        self.tick_times.append(self.clock[0])
+        self.clock[0] += self.tick_duration
+        if len(self.tick_times) == 4:
+            self.server.running = False
+
+    def test_ticks_follow_interval(self):
+        """Test that next_tick advances by broadcast_interval from the loop start"""
+        self.tick_duration = 0.1
+
+        self.server.run_event_loop()
+
+        interval = self.server.broadcast_interval
+        for n, tick_time in enumerate(self.tick_times, start=1):
+            self.assertAlmostEqual(tick_time, 100.0 + n * interval)
+
+    def test_overrun_starts_fresh_schedule(self):
+        """Test that a tick longer than the interval doesn't trigger catch-up ticks"""
+        interval = self.server.broadcast_interval
+        self.tick_duration = interval * 2.5
+
+        self.server.run_event_loop()
+
+        # Each tick ends after next_tick has passed, so the next one is a full interval later
+        for previous, current in zip(self.tick_times, self.tick_times[1:]):
+            self.assertAlmostEqual(current - previous, self.tick_duration + interval)
+
+    def test_tick_error_does_not_stop_loop(self):
+        """Test that an exception from game_tick is logged and the next tick still runs"""
+        def tick():
+            self.record_tick()
+            if len(self.tick_times) == 1:
+                raise RuntimeError("boom")
+        self.server.game_tick.side_effect = tick
+
+        self.server.run_event_loop()
+
+        self.assertEqual(len(self.tick_times), 4)
+
+    def test_leaderboard_interval(self):
+        """Test that the leaderboard is sent once per LEADERBOARD_INTERVAL"""
+        def tick():
+            self.tick_times.append(self.clock[0])
+            if self.clock[0] >= 100.0 + 2 * LEADERBOARD_INTERVAL + 0.5:
+                self.server.running = False
+        self.server.game_tick.side_effect = tick
+
+        self.server.run_event_loop()
+
+        self.assertEqual(self.server.send_leaderboard.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ Quick test to verify statistics system works
 """
 import os
 import json
+from unittest.mock import patch
 from server import GameServer
 
 def test_stats_system():
@@ -74,5 +75,33 @@ def test_stats_system():
     
     print("\n✅ All tests passed!")
 
+def test_stats_saved_on_flush():
+    """Test that stat updates are batched until flush_stats"""
+    stats_file = 'player_stats_flush_test.json'
+    if os.path.exists(stats_file):
+        os.remove(stats_file)
+    
+    with patch('socket.socket'):
+        server = GameServer()
+    server.stats_file = stats_file
+    server.stats = server.create_empty_stats()
+    
+    try:
+        # Updates stay in memory
+        server.update_player_stats('TestPlayer1', 500, died=True)
+        assert server.stats_dirty
+        assert not os.path.exists(stats_file)
+        
+        # Flush writes them once and clears the flag
+        server.flush_stats()
+        assert not server.stats_dirty
+        with open(stats_file, 'r') as f:
+            assert json.load(f)['players']['TestPlayer1']['total_deaths'] == 1
+        assert not os.path.exists(f"{stats_file}.tmp")
+    finally:
+        if os.path.exists(stats_file):
+            os.remove(stats_file)
+
 if __name__ == '__main__':
     test_stats_system()
+    test_stats_saved_on_flush()